@@ -1,10 +1,13 @@
+import asyncio
 import inspect
 import logging
 import os
 import sys
+from dataclasses import dataclass
 from typing import Any, Final
 
 from asyncpraw.reddit import Reddit
+from asyncprawcore.exceptions import InvalidToken, OAuthException, ResponseException
 
 
 def get_file_path() -> str:
@@ -31,6 +34,11 @@ TWITTER_KEY: Final = os.environ.get("TWITTER_KEY")
 TWITTER_SECRET: Final = os.environ.get("TWITTER_SECRET")
 TWITTER_TOKEN: Final = os.environ.get("TWITTER_TOKEN")
 TWITTER_TOKEN_SECRET: Final = os.environ.get("TWITTER_TOKEN_SECRET")
+NFL_CACHE_DIRECTORY: Final = os.environ.get("NFL_CACHE_DIRECTORY")
+CONTENT_HASH_FILE: Final = os.environ.get("CONTENT_HASH_FILE")
+STREAM_CHECKPOINT_FILE: Final = os.environ.get("STREAM_CHECKPOINT_FILE")
+# Keep the raw NFL payload on models, for debugging
+KEEP_RAW_DATA: Final = os.environ.get("KEEP_RAW_DATA", "").lower() in ("1", "true", "yes")
 MODULE_DIRECTORY: Final = get_file_path()
 ASSETS_DIRECTORY: Final = os.path.normpath(MODULE_DIRECTORY + "/../assets")
 
@@ -38,21 +46,142 @@ logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 logger: Final = logging.getLogger(__name__)
 
 
-class AsyncGenReddit:
+@dataclass(frozen=True)
+class Tenant:
+    """Team and the subreddit otto runs for it"""
+
+    team: str
+    sr_name: str
+
+
+def get_tenants(value: str | None) -> list[Tenant]:
+    """
+    Parse the teams and subreddits otto serves, defaulting to TEAM_NAME and SUBREDDIT_NAME.
+
+    value example: "CLE:Browns,PIT:steelers"
+    """
+    tenants = []
+    for pair in (value or "").split(","):
+        team, _, sr_name = pair.strip().partition(":")
+        if team and sr_name:
+            tenants.append(Tenant(team.strip(), sr_name.strip()))
+    return tenants or [Tenant(TEAM_NAME, SUBREDDIT_NAME)]
+
+
+TENANTS: Final = get_tenants(os.environ.get("TENANTS"))
+
+
+def _create_reddit() -> Reddit:
+    return Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        username=REDDIT_USERNAME,
+        password=REDDIT_PASSWORD,
+        user_agent="Otto by /u/markis",
+    )
+
+
+def is_auth_failure(err: BaseException | None) -> bool:
+    if isinstance(err, InvalidToken | OAuthException):
+        return True
+    return isinstance(err, ResponseException) and err.response.status == 401
+
+
+class RedditManager:
+    """
+    Keep one authenticated Reddit client, and its connection pool, for the whole process.
+
+    The client is only replaced after an authentication failure. Callers hold
+    the client between `acquire` and `release`, and a replaced client keeps
+    working for them until the last one releases it, then it is closed.
+    """
+
     def __init__(self) -> None:
-        self.reddit = Reddit(
-            client_id=REDDIT_CLIENT_ID,
-            client_secret=REDDIT_CLIENT_SECRET,
-            username=REDDIT_USERNAME,
-            password=REDDIT_PASSWORD,
-            user_agent="Otto by /u/markis",
-        )
+        self._reddit: Reddit | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Callers holding each client, by id of the client
+        self._users: dict[int, int] = {}
+        # Replaced clients that are still held by a caller
+        self._retired: dict[int, Reddit] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def get(self) -> Reddit:
+        loop = asyncio.get_running_loop()
+        if self._reddit is None or self._loop is not loop:
+            if self._reddit is not None:
+                # The client of a previous event loop can't be used from this one
+                self._users.pop(id(self._reddit), None)
+                task = loop.create_task(self._close(self._reddit))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            self._reddit = _create_reddit()
+            self._loop = loop
+        return self._reddit
+
+    def acquire(self) -> Reddit:
+        reddit = self.get()
+        self._users[id(reddit)] = self._users.get(id(reddit), 0) + 1
+        return reddit
+
+    async def release(self, reddit: Reddit) -> None:
+        users = self._users.pop(id(reddit), 0) - 1
+        if users > 0:
+            self._users[id(reddit)] = users
+        elif id(reddit) in self._retired:
+            await self._close(self._retired.pop(id(reddit)))
+
+    async def rebuild(self, stale: Reddit | None = None) -> None:
+        """
+        Replace the client after an authentication failure.
+
+        When `stale` is given and has already been replaced, by a caller that
+        hit the same failure, the current client is kept.
+        """
+        reddit = self._reddit
+        if reddit is None or (stale is not None and stale is not reddit):
+            return
+        logger.warning("Rebuilding Reddit client after an authentication failure")
+        self._reddit = None
+        if self._users.get(id(reddit)):
+            self._retired[id(reddit)] = reddit
+        else:
+            await self._close(reddit)
+
+    async def close(self) -> None:
+        clients = [*self._retired.values(), *([self._reddit] if self._reddit is not None else [])]
+        self._reddit = None
+        self._loop = None
+        self._users.clear()
+        self._retired.clear()
+        for reddit in clients:
+            await self._close(reddit)
+
+    async def _close(self, reddit: Reddit) -> None:
+        try:
+            await reddit.close()
+        except Exception:
+            logger.debug("Unable to close a Reddit client", exc_info=True)
+
+
+reddit_manager: Final = RedditManager()
+
+
+class AsyncGenReddit:
+    def __init__(self, manager: RedditManager = reddit_manager) -> None:
+        self.manager = manager
+        self._reddit: Reddit | None = None
 
     async def __aenter__(self) -> Reddit:
-        return self.reddit
+        self._reddit = self.manager.acquire()
+        return self._reddit
 
-    async def __aexit__(self, *_: Any) -> None:
-        await self.reddit.close()
+    async def __aexit__(self, _: Any, err: BaseException | None, *__: Any) -> None:
+        reddit, self._reddit = self._reddit, None
+        if reddit is None:
+            return
+        if is_auth_failure(err):
+            await self.manager.rebuild(stale=reddit)
+        await self.manager.release(reddit)
 
 
 def get_reddit() -> AsyncGenReddit:
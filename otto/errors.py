@@ -1,2 +1,6 @@
 class SidebarBackgroundImageError(BaseException):
     pass
+
+
+class TweetUnavailableError(Exception):
+    """The tweet is gone or hidden, like a deleted tweet or one from a protected or suspended account"""
@@ -1,56 +1,150 @@
 import asyncio
 import datetime
 import logging
-from typing import Final
+from collections.abc import Collection, Coroutine, Mapping, Sequence
+from typing import Any, Final
 
 from asyncpraw.reddit import Reddit
 
-from otto import SUBREDDIT_NAME, get_reddit
+from otto import TEAM_NAME, TENANTS, Tenant, get_reddit, is_auth_failure, reddit_manager
 from otto.config import Config, get_config
+from otto.lib.league import League, fetch_league
 from otto.lib.nfl_client import NFLClient
+from otto.lib.scheduler import Cadence, JobScheduler
 from otto.lib.update_downvote import update_downvote
 from otto.lib.update_sidebar_score import update_sidebar_score
-from otto.utils import repeat
+from otto.models.game import Game
+from otto.utils.http import close_session
+from otto.utils.timer import Timer
 
 logger: Final = logging.getLogger(__name__)
 
+SIDEBAR_SCORE_JOB: Final = "sidebar_score"
+DOWNVOTE_JOB: Final = "downvote"
+ALL_JOBS: Final = frozenset({SIDEBAR_SCORE_JOB, DOWNVOTE_JOB})
+
+JOB_CADENCES: Final = {
+    SIDEBAR_SCORE_JOB: Cadence(live=60, game_day=5 * 60, season=30 * 60, offseason=6 * 60 * 60),
+    DOWNVOTE_JOB: Cadence(live=15 * 60, game_day=15 * 60, season=60 * 60, offseason=12 * 60 * 60),
+}
+DEFAULT_JOB_TIMEOUT: Final = 120.0
+JOB_TIMEOUTS: Final = {
+    SIDEBAR_SCORE_JOB: 50.0,
+    DOWNVOTE_JOB: 120.0,
+}
+
 
 async def run() -> None:
-    async with get_reddit() as reddit:
-        await main(reddit, sr_name=SUBREDDIT_NAME)
+    try:
+        await main()
+    finally:
+        await reddit_manager.close()
+        await close_session()
 
 
-async def main(reddit: Reddit, sr_name: str = SUBREDDIT_NAME) -> None:
-    config = await get_config(reddit, sr_name)
+async def main(tenants: Sequence[Tenant] = TENANTS) -> None:
+    async with get_reddit() as reddit:
+        configs = dict(zip(tenants, await asyncio.gather(*(get_config(reddit, tenant.sr_name) for tenant in tenants))))
+
+    league = League()
 
-    async def _run_jobs() -> None:
+    async def _run_jobs(jobs: set[str]) -> dict[str, list[Game]]:
         async with get_reddit() as reddit:
-            await run_jobs(config, reddit, sr_name)
+            return await run_tenant_jobs(configs, reddit, jobs, league)
+
+    cadences = {
+        get_job_key(tenant, name): cadence
+        for tenant, config in configs.items()
+        for name, cadence in JOB_CADENCES.items()
+        if is_job_enabled(config, name)
+    }
+    await JobScheduler(cadences).run(_run_jobs)
+
+
+def get_job_key(tenant: Tenant, name: str) -> str:
+    """
+    Name of a job of one subreddit in the scheduler.
+
+    key example: "Browns/sidebar_score"
+    """
+    return f"{tenant.sr_name}/{name}"
 
-    await repeat(300, _run_jobs)
+
+def is_job_enabled(config: Config, name: str) -> bool:
+    if name == SIDEBAR_SCORE_JOB:
+        return config.enable_automatic_sidebar_scores
+    elif name == DOWNVOTE_JOB:
+        return config.enable_automatic_downvotes
+    return False
+
+
+async def run_tenant_jobs(
+    configs: Mapping[Tenant, Config],
+    reddit: Reddit,
+    job_keys: Collection[str],
+    league: League | None = None,
+) -> dict[str, list[Game]]:
+    """
+    Refresh the league once and run the due jobs of every subreddit from it.
+
+    Returns the games of each job that ran, keyed like `job_keys`.
+    """
+    league = await fetch_league(NFLClient(), league=league)
+    tenant_jobs = {tenant: {name for name in ALL_JOBS if get_job_key(tenant, name) in job_keys} for tenant in configs}
+    tenant_jobs = {tenant: jobs for tenant, jobs in tenant_jobs.items() if jobs}
+    tenant_games = await asyncio.gather(
+        *(
+            run_jobs(configs[tenant], reddit, tenant.sr_name, jobs, team=tenant.team, league=league)
+            for tenant, jobs in tenant_jobs.items()
+        )
+    )
+    return {
+        get_job_key(tenant, name): games
+        for (tenant, jobs), games in zip(tenant_jobs.items(), tenant_games)
+        for name in jobs
+    }
 
 
 async def run_jobs(
     config: Config,
     reddit: Reddit,
     sr_name: str,
-) -> None:
-    logger.info(f"Running Jobs: {datetime.datetime.now()}")
-    client = NFLClient()
-    games = client.get_scores()
-    records = client.get_standings()
-
-    if config.enable_automatic_sidebar_scores:
-        try:
-            await update_sidebar_score(config, reddit, sr_name, games, records)
-        except Exception as e:
-            logger.exception(e)
-
-    if config.enable_automatic_downvotes:
-        try:
-            await update_downvote(config, reddit, sr_name, games)
-        except Exception as e:
-            logger.exception(e)
+    jobs: Collection[str] = ALL_JOBS,
+    team: str = TEAM_NAME,
+    league: League | None = None,
+) -> list[Game]:
+    logger.info(f"Running Jobs for r/{sr_name}: {datetime.datetime.now()} {', '.join(sorted(jobs))}")
+    league = league or await fetch_league(NFLClient())
+    games = league.get_games(team)
+
+    job_runs: dict[str, Coroutine[Any, Any, None]] = {}
+    if config.enable_automatic_sidebar_scores and SIDEBAR_SCORE_JOB in jobs:
+        records = league.get_division_records(team)
+        job_runs[SIDEBAR_SCORE_JOB] = update_sidebar_score(config, reddit, sr_name, games, records)
+    if config.enable_automatic_downvotes and DOWNVOTE_JOB in jobs:
+        job_runs[DOWNVOTE_JOB] = update_downvote(config, reddit, sr_name, games)
+
+    latencies = await asyncio.gather(*(_run_job(name, job_run, reddit) for name, job_run in job_runs.items()))
+    if job_runs:
+        summary = ", ".join(f"{name}={latency:.2f}s" for name, latency in zip(job_runs, latencies))
+        logger.info(f"Jobs finished for r/{sr_name}: {summary}")
+    return games
+
+
+async def _run_job(name: str, job_run: Coroutine[Any, Any, None], reddit: Reddit | None = None) -> float:
+    """Run a single job within its timeout, so it can't fail or hold up the other jobs"""
+    timeout = JOB_TIMEOUTS.get(name, DEFAULT_JOB_TIMEOUT)
+    timer = Timer()
+    try:
+        with timer:
+            await asyncio.wait_for(job_run, timeout)
+    except TimeoutError:
+        logger.error(f"Job {name} timed out after {timeout:.0f}s")
+    except Exception as e:
+        logger.exception(e)
+        if is_auth_failure(e):
+            await reddit_manager.rebuild(stale=reddit)
+    return timer.elapsed
 
 
 if __name__ == "__main__":
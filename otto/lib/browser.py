@@ -0,0 +1,272 @@
+import asyncio
+import functools
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Request, Route, async_playwright
+
+logger: Final = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE: Final = 2
+PAGE_MAX_USES: Final = 50
+# Seconds to wait for a free page
+LEASE_WAIT_TIMEOUT: Final = 30.0
+# Seconds a page can be held before the work done with it is cancelled
+LEASE_TIMEOUT: Final = 60.0
+
+MEDIA_RESOURCE_TYPES: Final = frozenset({"media"})
+HEAVY_RESOURCE_TYPES: Final = frozenset({"image", "media", "font"})
+TRACKER_HOSTS: Final = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "ads-twitter.com",
+    "ads-api.twitter.com",
+    "analytics.twitter.com",
+    "static.ads-twitter.com",
+)
+
+
+class PageWaitTimeoutError(TimeoutError):
+    """No page of a profile came free in time, the pool is smaller than the work asking for it"""
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """Kind of page handed out by the browser service, with its cookies and context options"""
+
+    name: str
+    cookies: list[Any] = field(default_factory=list, hash=False)
+    context_options: dict[str, Any] = field(default_factory=dict, hash=False)
+    size: int = BROWSER_POOL_SIZE
+    # Requests aborted before they leave the browser
+    blocked_resource_types: frozenset[str] = frozenset()
+    block_trackers: bool = False
+    block_third_party_frames: bool = False
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.blocked_resource_types) or self.block_trackers or self.block_third_party_frames
+
+    def is_blocked(self, request: Request) -> bool:
+        if request.resource_type in self.blocked_resource_types:
+            return True
+        host = urlsplit(request.url).hostname or ""
+        if self.block_trackers and _is_host_in(host, TRACKER_HOSTS):
+            return True
+        if self.block_third_party_frames and request.resource_type == "document":
+            try:
+                frame = request.frame
+            except Exception:
+                # Requests of service workers don't have a frame
+                return False
+            if frame.parent_frame is not None:
+                page_host = urlsplit(frame.page.main_frame.url).hostname or ""
+                return not _is_same_site(host, page_host)
+        return False
+
+
+def _is_host_in(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def _is_same_site(host: str, other: str) -> bool:
+    """Compare the last two labels of both hosts, good enough for x.com and twitter.com"""
+    return host.split(".")[-2:] == other.split(".")[-2:]
+
+
+async def _route_request(profile: BrowserProfile, route: Route) -> None:
+    if profile.is_blocked(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@dataclass
+class PooledPage:
+    profile: BrowserProfile
+    context: BrowserContext
+    page: Page
+    generation: int
+    uses: int = 0
+
+
+class PageLease:
+    """
+    Async context manager lending a warm page of a profile.
+
+    The page goes back to the pool on exit. It is recycled instead when the
+    work done with it failed or it has been used too many times.
+    """
+
+    def __init__(self, service: "BrowserService", profile: BrowserProfile, wait_timeout: float, timeout: float) -> None:
+        self._service = service
+        self._profile = profile
+        self._wait_timeout = wait_timeout
+        self._timeout = timeout
+        self._deadline: asyncio.Timeout | None = None
+        self._pooled: PooledPage | None = None
+
+    async def __aenter__(self) -> Page:
+        self._pooled = await self._service._acquire(self._profile, self._wait_timeout)
+        self._deadline = asyncio.timeout(self._timeout)
+        await self._deadline.__aenter__()
+        return self._pooled.page
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            if self._deadline:
+                await self._deadline.__aexit__(exc_type, exc, tb)
+        finally:
+            if self._pooled:
+                await self._service._release(self._pooled, failed=exc is not None)
+                self._pooled = None
+
+
+class BrowserService:
+    """
+    One long-lived Firefox shared by every caller that needs a web page.
+
+    Each profile has a pool of pages, each in its own context with the
+    profile's cookies already loaded. Pages are lent out with `lease`,
+    recycled after `max_uses` or a failure, and the whole browser is
+    relaunched when it crashes.
+
+    example:
+        async with browser_service.lease(profile) as page:
+            await page.goto(url)
+    """
+
+    def __init__(self, max_uses: int = PAGE_MAX_USES) -> None:
+        self.max_uses = max_uses
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._pools: dict[BrowserProfile, asyncio.Queue[PooledPage]] = {}
+        self._generation = 0
+        self._broken = False
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def lease(
+        self,
+        profile: BrowserProfile,
+        wait_timeout: float = LEASE_WAIT_TIMEOUT,
+        timeout: float = LEASE_TIMEOUT,
+    ) -> PageLease:
+        return PageLease(self, profile, wait_timeout, timeout)
+
+    async def warm(self, *profiles: BrowserProfile) -> None:
+        """Launch the browser and fill the page pools ahead of the first lease, the first lease retries on failure"""
+        for profile in profiles:
+            try:
+                await self._get_pool(profile)
+            except Exception:
+                logger.warning(f"Unable to warm up {profile.name} browser pages", exc_info=True)
+
+    async def close(self) -> None:
+        if self._lock is not None and self._loop is asyncio.get_running_loop():
+            async with self._lock:
+                await self._shutdown()
+        else:
+            await self._shutdown()
+
+    async def _acquire(self, profile: BrowserProfile, wait_timeout: float) -> PooledPage:
+        pool = await self._get_pool(profile)
+        try:
+            pooled = await asyncio.wait_for(pool.get(), wait_timeout)
+        except TimeoutError:
+            raise PageWaitTimeoutError(f"No free {profile.name} page after {wait_timeout:.0f}s") from None
+        if pooled.page.is_closed():
+            await self._discard(pooled)
+            pooled = await self._new_page(profile)
+        return pooled
+
+    async def _release(self, pooled: PooledPage, failed: bool) -> None:
+        if pooled.generation != self._generation:
+            # The browser was relaunched while the page was lent out
+            return
+
+        pooled.uses += 1
+        if failed or pooled.uses >= self.max_uses or pooled.page.is_closed():
+            await self._discard(pooled)
+            try:
+                pooled = await self._new_page(pooled.profile)
+            except Exception:
+                logger.warning("Unable to replace a browser page, relaunching the browser", exc_info=True)
+                self._broken = True
+                return
+        self._pools[pooled.profile].put_nowait(pooled)
+
+    async def _get_pool(self, profile: BrowserProfile) -> asyncio.Queue[PooledPage]:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._playwright = None
+            self._browser = None
+            self._pools = {}
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            if self._broken or self._browser is None or not self._browser.is_connected():
+                await self._launch()
+            pool = self._pools.get(profile)
+            if pool is None:
+                pool = asyncio.Queue()
+                for _ in range(profile.size):
+                    pool.put_nowait(await self._new_page(profile))
+                self._pools[profile] = pool
+            return pool
+
+    async def _launch(self) -> None:
+        if self._browser is not None:
+            logger.warning("Relaunching the browser")
+        await self._shutdown()
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.firefox.launch()
+        self._broken = False
+
+    async def _new_page(self, profile: BrowserProfile) -> PooledPage:
+        assert self._browser, "The browser isn't running"
+        context = await self._browser.new_context(**profile.context_options)
+        if profile.cookies:
+            await context.add_cookies(profile.cookies)
+        if profile.blocks_requests:
+            await context.route("**/*", functools.partial(_route_request, profile))
+        page = await context.new_page()
+        return PooledPage(profile, context, page, self._generation)
+
+    async def _discard(self, pooled: PooledPage) -> None:
+        try:
+            await pooled.context.close()
+        except Exception:
+            logger.debug("Unable to close a browser context", exc_info=True)
+
+    async def _shutdown(self) -> None:
+        """Close the browser, pages lent out from it are dropped when they come back"""
+        self._generation += 1
+        self._pools = {}
+        browser, playwright = self._browser, self._playwright
+        self._browser = None
+        self._playwright = None
+        try:
+            if browser is not None:
+                await browser.close()
+        except Exception:
+            logger.debug("Unable to close the browser", exc_info=True)
+        try:
+            if playwright is not None:
+                await playwright.stop()
+        except Exception:
+            logger.debug("Unable to stop playwright", exc_info=True)
+
+
+browser_service: Final = BrowserService()
@@ -1,8 +1,9 @@
 import logging
+from dataclasses import dataclass, field
 from textwrap import dedent
 from typing import Final
 
-from asyncpraw.models import Submission
+from asyncpraw.models import Comment, Submission
 from fuzzywuzzy import fuzz
 
 from otto.config import Config
@@ -14,10 +15,37 @@ from otto.lib.twitter_client import (
 logger: Final = logging.getLogger(__name__)
 
 
-async def check_post(config: Config, post: Submission) -> None:
+@dataclass
+class PostProgress:
+    """
+    Mod actions started on a post, kept across retries of its check.
+
+    Replies and reports add something new each time they are sent, so they
+    are never started twice, even when they failed, since a request that
+    timed out may still have gone through. Removing the comment and setting
+    the flair are safe to repeat.
+    """
+
+    comment: Comment | None = None
+    started: set[str] = field(default_factory=set)
+
+    def start(self, post: Submission, action: str) -> bool:
+        """True the first time an action is started on the post"""
+        if action in self.started:
+            logger.warning(f"Post {post.id}: skipping the {action}, an earlier check already started it")
+            return False
+        self.started.add(action)
+        return True
+
+
+async def check_post(config: Config, post: Submission, progress: PostProgress | None = None) -> None:
     """
     Check a post that it is not sensationalized based on the title of the source tweet.
+
+    A failed check can be retried, pass it the same `progress` so the reply
+    and the report of an earlier check aren't sent again.
     """
+    progress = progress or PostProgress()
     logger.info(f"Checking post: {post.id}")
     if post.approved_by:
         logger.info(f"Post already approved: {post.approved_by}")
@@ -32,12 +60,16 @@ async def check_post(config: Config, post: Submission) -> None:
 
     if source_title and post_title:
         partial_ratio = fuzz.partial_ratio(source_title, post_title)
-        diag_comment = await post.reply(_get_diagnostic_comment(config, source_title, post_title, partial_ratio))
-        assert diag_comment
-        await diag_comment.mod.remove()
+        if progress.start(post, "reply"):
+            diag_comment = await post.reply(_get_diagnostic_comment(config, source_title, post_title, partial_ratio))
+            assert diag_comment
+            progress.comment = diag_comment
+        if progress.comment:
+            await progress.comment.mod.remove()
         if partial_ratio < config.rule7_levenshtein_threshold:
             await post.mod.flair("Rule7")
-            await post.report("No Sensationalized Titles")
+            if progress.start(post, "report"):
+                await post.report("No Sensationalized Titles")
             logger.info(f"Post removed for Rule 7: {post.id}")
 
 
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Final
+
+from otto import CONTENT_HASH_FILE
+
+logger: Final = logging.getLogger(__name__)
+
+# How long a pushed hash is trusted before the target is read back from reddit again
+VERIFY_INTERVAL: Final = 6 * 60 * 60.0
+
+
+def get_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class ContentHashStore:
+    """
+    Hashes of the content last pushed to each reddit target.
+
+    A target is anything otto writes rendered text to, like the old reddit
+    sidebar or a new reddit widget. When the rendered text hashes the same as
+    what was last pushed, the target can be skipped without reading it back.
+    Hashes are only trusted for `verify_interval` seconds, after that the
+    target is compared against reddit again to catch manual edits.
+
+    key example: "Browns/widget/AFCN Standings"
+    """
+
+    def __init__(self, path: str | None = None, verify_interval: float = VERIFY_INTERVAL) -> None:
+        self.path = path
+        self.verify_interval = verify_interval
+        self._hashes: dict[str, tuple[str, float]] | None = None
+
+    def is_current(self, key: str, content: str) -> bool:
+        """True when `content` was pushed to the target and verified recently"""
+        entry = self._get_hashes().get(key)
+        if entry is None:
+            return False
+        content_hash, verified_at = entry
+        return content_hash == get_hash(content) and time.time() - verified_at < self.verify_interval
+
+    def record(self, key: str, content: str) -> None:
+        """Remember that the target now holds `content`"""
+        self._get_hashes()[key] = (get_hash(content), time.time())
+        self._save()
+
+    def forget(self, key: str) -> None:
+        if self._get_hashes().pop(key, None) is not None:
+            self._save()
+
+    def _get_hashes(self) -> dict[str, tuple[str, float]]:
+        if self._hashes is None:
+            self._hashes = self._load()
+        return self._hashes
+
+    def _load(self) -> dict[str, tuple[str, float]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return {key: (str(content_hash), float(verified_at)) for key, (content_hash, verified_at) in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            logger.warning(f"Ignoring unreadable content hash file: {self.path}", exc_info=True)
+            return {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._get_hashes(), f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.warning(f"Unable to write content hash file: {self.path}", exc_info=True)
+
+
+content_hashes: Final = ContentHashStore(path=CONTENT_HASH_FILE)
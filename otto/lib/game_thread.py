@@ -1,5 +1,7 @@
-import asyncio
+import logging
+from collections.abc import Coroutine
 from datetime import datetime, timedelta
+from typing import Any, Final
 
 from otto import TEAM_NAME
 from otto.lib.nfl_client import NFLClient
@@ -7,10 +9,23 @@ from otto.lib.weather_client import WeatherClient
 from otto.models.game import get_next_game
 from otto.models.team import get_location, get_subreddit
 from otto.types import SendMessage
-from otto.utils import get_time
+from otto.utils import get_time, timed_gather
+from otto.utils.http import run_sync
+
+logger: Final = logging.getLogger(__name__)
 
 weather_client = WeatherClient()
 
+FETCH_CONCURRENCY: Final = 4
+STAT_LEADERS: Final = (
+    ("Passing", "passing.yards"),
+    ("Rushing", "rushing.yards"),
+    ("Receiving", "receiving.yards"),
+    ("Tackles", "defensive.combineTackles"),
+    ("Interceptions", "defensive.interceptions"),
+    ("Sacks", "defensive.sacks"),
+)
+
 standings_header = """
 |Team|Record|Home|Road|Division|Conference|Streak|
 |:-----:|:-----:|:------:|:------:|:------:|:------:|:------:|
@@ -24,8 +39,8 @@ def _maybe_add_tie(tie: int) -> str:
         return ""
 
 
-def _get_standings_table(nfl_client: NFLClient, team: str, opponent: str) -> str:
-    records = nfl_client.get_standings(teams=[team, opponent])
+async def _get_standings_table(nfl_client: NFLClient, team: str, opponent: str) -> str:
+    records = await nfl_client.fetch_standings(teams=[team, opponent])
 
     standings_rows = []
     for record in records:
@@ -45,18 +60,39 @@ def _get_standings_table(nfl_client: NFLClient, team: str, opponent: str) -> str
     return standings_header + "\n".join(standings_rows)
 
 
-def _get_weather(team_abbr: str, game_time: datetime) -> str:
+async def _get_weather(team_abbr: str, game_time: datetime) -> str:
     lat, lon = get_location(team_abbr)
     try:
-        w = weather_client.get_weather(lat, lon, game_time)
+        w = await weather_client.fetch_weather(lat, lon, game_time)
         if w:
             return f"{w.temperature}° - {w.forecast} - Wind {w.wind_direction} {w.wind_speed}"
-    except BaseException:
+    except Exception:
         pass
 
     return ""
 
 
+async def _collect_game_thread_data(
+    nfl_client: NFLClient,
+    team_abbr: str,
+    next_abbr: str,
+    location_abbr: str,
+    game_time: datetime,
+) -> dict[str, Any]:
+    """Issue every independent fetch for the game thread at once."""
+    fetches: dict[str, Coroutine[Any, Any, Any]] = {
+        "standings": _get_standings_table(nfl_client, team_abbr, next_abbr),
+        "weather": _get_weather(location_abbr, game_time),
+        "leaders": nfl_client.fetch_stat_leaders([stat for _, stat in STAT_LEADERS], [team_abbr, next_abbr]),
+    }
+
+    results, timings = await timed_gather(fetches, FETCH_CONCURRENCY)
+
+    timing_summary = ", ".join(f"{name}={elapsed:.2f}s" for name, elapsed in sorted(timings.items()))
+    logger.info(f"Game thread fetches took {max(timings.values()):.2f}s: {timing_summary}")
+    return results
+
+
 async def _default_send_message(msg: str) -> None:
     """Default send_message will just print to console"""
     print(msg)
@@ -66,7 +102,7 @@ async def generate_game_thread(
     send_message: SendMessage = _default_send_message,
 ) -> None:
     nfl_client = NFLClient()
-    games = nfl_client.get_scores()
+    games = await nfl_client.fetch_scores()
 
     next_game = get_next_game(games, timedelta())
 
@@ -77,29 +113,21 @@ async def generate_game_thread(
     next_abbr = next_team.abbr
     next_location_abbr = team_abbr if next_game.at_home else next_abbr
 
-    # game_data = nfl_client.get_game(next_game.id)
+    # game_data = await nfl_client.fetch_game(next_game.id)
     # game_detail_id = game_data["gameDetailId"]
-    # details = nfl_client.get_game_details(game_detail_id)
+    # details = await nfl_client.fetch_game_details(game_detail_id)
 
-    standings_table = _get_standings_table(nfl_client, team_abbr, next_abbr)
-    weather_forecast = _get_weather(next_location_abbr, next_game.game_time)
+    data = await _collect_game_thread_data(nfl_client, team_abbr, next_abbr, next_location_abbr, next_game.game_time)
+    standings_table: str = data["standings"]
+    weather_forecast: str = data["weather"]
+    leaders: dict[str, dict[str, str]] = data["leaders"]
 
     team_subreddit = get_subreddit(team_abbr)
     next_subreddit = get_subreddit(next_abbr)
 
-    team_pass_lead = nfl_client.get_stat_leader("passing.yards", team_abbr)
-    team_rush_lead = nfl_client.get_stat_leader("rushing.yards", team_abbr)
-    team_rec_lead = nfl_client.get_stat_leader("receiving.yards", team_abbr)
-    team_tack_lead = nfl_client.get_stat_leader("defensive.combineTackles", team_abbr)
-    team_int_lead = nfl_client.get_stat_leader("defensive.interceptions", team_abbr)
-    team_sack_lead = nfl_client.get_stat_leader("defensive.sacks", team_abbr)
-
-    next_pass_lead = nfl_client.get_stat_leader("passing.yards", next_abbr)
-    next_rush_lead = nfl_client.get_stat_leader("rushing.yards", next_abbr)
-    next_rec_lead = nfl_client.get_stat_leader("receiving.yards", next_abbr)
-    next_tack_lead = nfl_client.get_stat_leader("defensive.combineTackles", next_abbr)
-    next_int_lead = nfl_client.get_stat_leader("defensive.interceptions", next_abbr)
-    next_sack_lead = nfl_client.get_stat_leader("defensive.sacks", next_abbr)
+    leader_rows = "\n".join(
+        f"|**{label}**|{leaders[next_abbr][stat]}|{leaders[team_abbr][stat]}|" for label, stat in STAT_LEADERS
+    )
 
     title = f"[GAME DAY THREAD] {team_name} vs {next_team.name}"
 
@@ -140,12 +168,7 @@ async def generate_game_thread(
 
 ||{season} [{next_team.name}]({next_subreddit}) Leaders|{season} [{team_name}]({team_subreddit}) Leaders|
 |:-----:|:-----:|:------:|
-|**Passing**|{next_pass_lead}|{team_pass_lead}|
-|**Rushing**|{next_rush_lead}|{team_rush_lead}|
-|**Receiving**|{next_rec_lead}|{team_rec_lead}|
-|**Tackles**|{next_tack_lead}|{team_tack_lead}|
-|**Interceptions**|{next_int_lead}|{team_int_lead}|
-|**Sacks**|{next_sack_lead}|{team_sack_lead}|
+{leader_rows}
     """
 
     message = f"""
@@ -159,4 +182,4 @@ async def generate_game_thread(
 
 
 if __name__ == "__main__":
-    asyncio.run(generate_game_thread())
+    run_sync(generate_game_thread())
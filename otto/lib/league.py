@@ -0,0 +1,176 @@
+import asyncio
+import bisect
+import json
+from array import array
+from datetime import datetime
+from typing import Any
+
+from otto.lib.nfl_client import NFLClient
+from otto.lib.scheduler import FINAL_PHASES
+from otto.models.game import Game
+from otto.models.record import Record
+from otto.models.standings import StandingsTable
+from otto.utils import convert_isostring, get_now
+
+
+def _hash_game(data: dict[str, Any]) -> int:
+    return hash(json.dumps(data, sort_keys=True))
+
+
+class League:
+    """
+    Snapshot of the schedule and standings of the whole league, shared by every subreddit.
+
+    Games are kept in parallel arrays indexed by position, with indexes by
+    team, by week and by game id on top. The raw payload of a game isn't
+    kept, only a hash of it to tell when it changed, along with the `Game`
+    views of both teams built when it did.
+    """
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.hashes: list[int] = []
+        self.times: array[float] = array("d")
+        self.weeks: list[tuple[str, int]] = []
+        self.home_teams: list[str] = []
+        self.visitor_teams: list[str] = []
+        self.home_scores: array[int] = array("i")
+        self.visitor_scores: array[int] = array("i")
+        self.phases: list[str] = []
+        # The game as seen by each of its teams
+        self.home_views: list[Game] = []
+        self.visitor_views: list[Game] = []
+
+        self.by_id: dict[str, int] = {}
+        # Positions of each team's games, ordered by kickoff
+        self.by_team: dict[str, list[int]] = {}
+        self.by_week: dict[tuple[str, int], list[int]] = {}
+
+        self.standings = StandingsTable([])
+
+    def update_schedule(self, schedule: list[dict[str, Any]]) -> list[str]:
+        """Merge in a fresh copy of the schedule, returns the ids of the games that changed"""
+        changed: list[str] = []
+        for data in schedule:
+            index = self.by_id.get(data["id"])
+            data_hash = _hash_game(data)
+            if index is None:
+                self._add(data, data_hash)
+            elif self.hashes[index] != data_hash:
+                self._replace(index, data, data_hash)
+            else:
+                continue
+            changed.append(data["id"])
+        return changed
+
+    def update_standings(self, standings: StandingsTable) -> None:
+        self.standings = standings
+
+    def get_games(self, team: str) -> list[Game]:
+        """Games of `team` as seen by that team, ordered by kickoff"""
+        return [self._get_view(index, team) for index in self.by_team.get(team, [])]
+
+    def get_game(self, id: str) -> Game | None:
+        """The game as seen by the home team"""
+        index = self.by_id.get(id)
+        return self.home_views[index] if index is not None else None
+
+    def get_week(self, season_type: str, week: int) -> list[Game]:
+        """Games of a week as seen by the home teams, ordered by kickoff"""
+        return [self.home_views[index] for index in self.by_week.get((season_type, week), [])]
+
+    def get_next_game(self, team: str, now: datetime | None = None) -> Game | None:
+        now = now or get_now()
+        indexes = self.by_team.get(team, [])
+        position = bisect.bisect_right(indexes, now.timestamp(), key=self.times.__getitem__)
+        return self._get_view(indexes[position], team) if position < len(indexes) else None
+
+    def get_division_records(self, team: str) -> list[Record]:
+        return self.standings.get_records(self.standings.get_team_division(team))
+
+    def get_head_to_head(self, team: str, opponent: str) -> tuple[int, int, int]:
+        """Wins, losses and ties of `team` against `opponent` in finished games"""
+        win = loss = tie = 0
+        for index in self.by_team.get(team, []):
+            if self.phases[index] not in FINAL_PHASES or opponent not in (
+                self.home_teams[index],
+                self.visitor_teams[index],
+            ):
+                continue
+            score, opponent_score = self.home_scores[index], self.visitor_scores[index]
+            if self.visitor_teams[index] == team:
+                score, opponent_score = opponent_score, score
+            if score > opponent_score:
+                win += 1
+            elif score < opponent_score:
+                loss += 1
+            else:
+                tie += 1
+        return win, loss, tie
+
+    def _add(self, data: dict[str, Any], data_hash: int) -> None:
+        index = len(self.ids)
+        self.ids.append(data["id"])
+        self.hashes.append(0)
+        self.times.append(0.0)
+        self.weeks.append(("", 0))
+        self.home_teams.append("")
+        self.visitor_teams.append("")
+        self.home_scores.append(0)
+        self.visitor_scores.append(0)
+        self.phases.append("")
+        self.by_id[data["id"]] = index
+        self._set(index, data, data_hash)
+
+    def _replace(self, index: int, data: dict[str, Any], data_hash: int) -> None:
+        self._unindex(index)
+        self._set(index, data, data_hash)
+
+    def _set(self, index: int, data: dict[str, Any], data_hash: int) -> None:
+        self.hashes[index] = data_hash
+        self.times[index] = convert_isostring(data["gameTime"]).timestamp()
+        week = data["week"]
+        self.weeks[index] = (week["seasonType"], int(week["week"]))
+        self.home_teams[index] = (data.get("homeTeam") or {}).get("abbr", "")
+        self.visitor_teams[index] = (data.get("visitorTeam") or {}).get("abbr", "")
+        self.home_scores[index] = int((data.get("homeTeamScore") or {}).get("pointsTotal", 0))
+        self.visitor_scores[index] = int((data.get("visitorTeamScore") or {}).get("pointsTotal", 0))
+        self.phases[index] = (data.get("gameStatus") or {}).get("phase", "")
+
+        home_view = Game.from_nfl_dict(data, self.home_teams[index])
+        visitor_view = Game.from_nfl_dict(data, self.visitor_teams[index])
+        if index < len(self.home_views):
+            self.home_views[index] = home_view
+            self.visitor_views[index] = visitor_view
+        else:
+            self.home_views.append(home_view)
+            self.visitor_views.append(visitor_view)
+
+        self._insert(self.by_week.setdefault(self.weeks[index], []), index)
+        for team in (self.home_teams[index], self.visitor_teams[index]):
+            if team:
+                self._insert(self.by_team.setdefault(team, []), index)
+
+    def _unindex(self, index: int) -> None:
+        self.by_week[self.weeks[index]].remove(index)
+        for team in (self.home_teams[index], self.visitor_teams[index]):
+            if team:
+                self.by_team[team].remove(index)
+
+    def _get_view(self, index: int, team: str) -> Game:
+        return self.visitor_views[index] if self.visitor_teams[index] == team else self.home_views[index]
+
+    def _insert(self, indexes: list[int], index: int) -> None:
+        bisect.insort(indexes, index, key=lambda i: (self.times[i], i))
+
+
+async def fetch_league(client: NFLClient, season: str = "2021", league: League | None = None) -> League:
+    """Fetch the schedule and standings of the whole league, updating `league` in place when given"""
+    schedule, standings = await asyncio.gather(
+        client.fetch_schedule(season),
+        client.fetch_standings_table(season),
+    )
+    league = league or League()
+    league.update_schedule(schedule)
+    league.update_standings(standings)
+    return league
@@ -0,0 +1,163 @@
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Final
+
+from otto.lib.nfl_client import NFLClient
+from otto.lib.nfl_stream import GameDetailItem
+
+logger: Final = logging.getLogger(__name__)
+
+# Number of most recent plays fetched again on every poll, to catch reviews and deleted plays
+RECHECK_PLAYS: Final = 8
+TURNOVER_TRANSITIONS: Final = frozenset({"FUMBLE", "INTERCEPTION", "DOWNS"})
+# Fields of a play that change when the play itself is corrected, others like nextPlayType move on every poll
+PLAY_FINGERPRINT_FIELDS: Final = (
+    "playDescription",
+    "playType",
+    "playDeleted",
+    "playReviewStatus",
+    "penaltyOnPlay",
+    "scoringPlay",
+    "scoringPlayType",
+    "scoringTeam",
+    "playStats",
+)
+
+
+class LiveEventKind(Enum):
+    PLAY = "play"
+    SCORING_PLAY = "scoring_play"
+    PLAY_CHANGED = "play_changed"
+    TURNOVER = "turnover"
+    PERIOD_CHANGE = "period_change"
+    PHASE_CHANGE = "phase_change"
+
+
+@dataclass(frozen=True)
+class LiveGameEvent:
+    kind: LiveEventKind
+    game_detail_id: str
+    sequence: float
+    description: str
+    data: dict[str, Any]
+
+
+@dataclass
+class LiveGameState:
+    game_detail_id: str
+    primed: bool = False
+    period: int | None = None
+    phase: str | None = None
+    last_drive_sequence: float = -1.0
+    last_drive_transition: str | None = None
+    # orderSequence of the newest play that dropped out of the recheck window
+    play_floor: float = -1.0
+    recent_plays: OrderedDict[float, int] = field(default_factory=OrderedDict)
+
+    @property
+    def last_play_sequence(self) -> float:
+        return next(reversed(self.recent_plays), self.play_floor)
+
+
+def _fingerprint(data: dict[str, Any]) -> int:
+    return hash(json.dumps([data.get(key) for key in PLAY_FINGERPRINT_FIELDS], sort_keys=True))
+
+
+class LiveGameTracker:
+    """
+    Follow live games and turn each poll of the game detail into small deltas.
+
+    Only drives and plays newer than what was already seen are parsed, plus a
+    short window of recent plays to notice reviewed or deleted plays. The
+    first poll of a game only records its state unless `emit_history` is set.
+    """
+
+    def __init__(self, client: NFLClient | None = None, emit_history: bool = False) -> None:
+        self.client = client or NFLClient()
+        self.emit_history = emit_history
+        self._games: dict[str, LiveGameState] = {}
+
+    def get_state(self, game_detail_id: str) -> LiveGameState:
+        state = self._games.get(game_detail_id)
+        if state is None:
+            state = LiveGameState(game_detail_id)
+            self._games[game_detail_id] = state
+        return state
+
+    def forget(self, game_detail_id: str) -> None:
+        self._games.pop(game_detail_id, None)
+
+    async def poll(self, game_detail_id: str) -> list[LiveGameEvent]:
+        state = self.get_state(game_detail_id)
+        items: list[GameDetailItem] = []
+        after_drive = state.last_drive_sequence - 1 if state.last_drive_sequence >= 0 else -1.0
+        async with self.client.stream_game_details(game_detail_id, state.play_floor, after_drive) as stream:
+            async for item in stream:
+                items.append(item)
+
+        events = self._apply(state, items, stream.detail or {})
+        emit = state.primed or self.emit_history
+        state.primed = True
+        if events and emit:
+            logger.info(f"Game {game_detail_id}: {len(events)} new events")
+        return events if emit else []
+
+    def _apply(self, state: LiveGameState, items: list[GameDetailItem], detail: dict[str, Any]) -> list[LiveGameEvent]:
+        events: list[LiveGameEvent] = []
+        for item in items:
+            if item.kind == "drive":
+                self._apply_drive(state, item, events)
+            else:
+                self._apply_play(state, item, events)
+
+        period = detail.get("period")
+        if period is not None and period != state.period:
+            if state.period is not None:
+                events.append(self._event(LiveEventKind.PERIOD_CHANGE, state, -1.0, f"Quarter {period}", detail))
+            state.period = period
+
+        phase = detail.get("phase")
+        if phase is not None and phase != state.phase:
+            if state.phase is not None:
+                events.append(self._event(LiveEventKind.PHASE_CHANGE, state, -1.0, phase, detail))
+            state.phase = phase
+
+        return events
+
+    def _apply_drive(self, state: LiveGameState, item: GameDetailItem, events: list[LiveGameEvent]) -> None:
+        sequence = item.order_sequence
+        transition = item.data.get("endTransition")
+        if sequence < state.last_drive_sequence:
+            return
+        previous = state.last_drive_transition if sequence == state.last_drive_sequence else None
+        if transition in TURNOVER_TRANSITIONS and transition != previous:
+            description = item.data.get("howEndedDescription") or str(transition)
+            events.append(self._event(LiveEventKind.TURNOVER, state, sequence, description, item.data))
+        state.last_drive_sequence = sequence
+        state.last_drive_transition = transition
+
+    def _apply_play(self, state: LiveGameState, item: GameDetailItem, events: list[LiveGameEvent]) -> None:
+        sequence = item.order_sequence
+        fingerprint = _fingerprint(item.data)
+        description = item.data.get("playDescription") or ""
+
+        previous = state.recent_plays.get(sequence)
+        if previous is None:
+            if not item.data.get("playDeleted"):
+                kind = LiveEventKind.SCORING_PLAY if item.data.get("scoringPlay") else LiveEventKind.PLAY
+                events.append(self._event(kind, state, sequence, description, item.data))
+        elif previous != fingerprint:
+            events.append(self._event(LiveEventKind.PLAY_CHANGED, state, sequence, description, item.data))
+
+        state.recent_plays[sequence] = fingerprint
+        while len(state.recent_plays) > RECHECK_PLAYS:
+            floor, _ = state.recent_plays.popitem(last=False)
+            state.play_floor = max(state.play_floor, floor)
+
+    def _event(
+        self, kind: LiveEventKind, state: LiveGameState, sequence: float, description: str, data: dict[str, Any]
+    ) -> LiveGameEvent:
+        return LiveGameEvent(kind, state.game_detail_id, sequence, description, data)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+from typing import Final
+
+from otto.utils.http import get_session
+
+logger: Final = logging.getLogger(__name__)
+
+TOKEN_DEFAULT_TTL: Final = 60 * 60.0
+TOKEN_REFRESH_MARGIN: Final = 5 * 60.0
+TOKEN_RETRY_INTERVAL: Final = 30.0
+
+
+class TokenManager:
+    """
+    Process-wide holder of the NFL API client credentials token.
+
+    The token is refreshed in the background shortly before it expires, and
+    concurrent refreshes share a single request to the token endpoint.
+    """
+
+    def __init__(self, url: str, refresh_margin: float = TOKEN_REFRESH_MARGIN) -> None:
+        self.url = url
+        self.refresh_margin = refresh_margin
+        self._token: str | None = None
+        # When the token should be replaced, ahead of when it expires
+        self._refresh_at = 0.0
+        self._refresh_task: asyncio.Task[str] | None = None
+        self._refresher: asyncio.Task[None] | None = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self._token is not None and time.time() < self._refresh_at
+
+    async def get_token(self) -> str:
+        self._ensure_refresher()
+        if self._token and self.is_valid:
+            return self._token
+        return await self.refresh()
+
+    async def refresh(self, stale_token: str | None = None) -> str:
+        """
+        Fetch a new token, joining a refresh that is already in flight.
+
+        When *stale_token* is given and another caller has already replaced it,
+        the current token is returned without another request.
+        """
+        if stale_token and self._token and self._token != stale_token:
+            return self._token
+
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._request_token())
+            self._refresh_task = task
+        return await asyncio.shield(task)
+
+    async def _request_token(self) -> str:
+        async with get_session().post(
+            self.url,
+            data={"grant_type": "client_credentials"},
+            headers={"X-Domain-Id": "100"},
+        ) as res:
+            data = await res.json(content_type=None)
+
+        token = data["access_token"]
+        assert isinstance(token, str)
+        self._token = token
+        ttl = float(data.get("expires_in") or TOKEN_DEFAULT_TTL)
+        # Short lived tokens are still used for half their life instead of being refreshed on every call
+        self._refresh_at = time.time() + ttl - min(self.refresh_margin, ttl / 2)
+        return token
+
+    def _ensure_refresher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._refresher is None or self._refresher.done() or self._refresher.get_loop() is not loop:
+            self._refresher = loop.create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            delay = self._refresh_at - time.time()
+            await asyncio.sleep(max(delay, TOKEN_RETRY_INTERVAL))
+            if self.is_valid:
+                continue
+            try:
+                await self.refresh()
+            except Exception:
+                logger.warning("Unable to refresh NFL API token", exc_info=True)
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Final
+
+from otto import NFL_CACHE_DIRECTORY
+
+logger: Final = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES: Final = 128
+
+SCHEDULE_TTL: Final = 30.0
+STANDINGS_TTL: Final = 15 * 60.0
+STAT_LEADERS_TTL: Final = 60 * 60.0
+GAME_TTL: Final = 60 * 60.0
+GAME_DETAIL_TTL: Final = 10.0
+DEFAULT_TTL: Final = 60.0
+
+
+def get_ttl(url: str) -> float:
+    """
+    Pick the time to live of a response by the kind of data the query asks for.
+
+    url example: "https://api.nfl.com/v1/games?s={...}&fs={...}"
+    """
+    path = url.split("?", 1)[0]
+    if path.endswith("/v1/games"):
+        return SCHEDULE_TTL
+    elif path.endswith("/v1/playerTeamStats"):
+        return STAT_LEADERS_TTL
+    elif "/v3/shield" in path:
+        if "standings(" in url:
+            return STANDINGS_TTL
+        elif "gameDetail(" in url:
+            return GAME_DETAIL_TTL
+        elif "game(" in url:
+            return GAME_TTL
+    return DEFAULT_TTL
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    data: Any
+    stored_at: float
+    ttl: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Headers for a conditional request revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of NFL API responses keyed by the normalized query url.
+
+    Expired entries are kept around so they can be revalidated with a
+    conditional request. When a directory is given every stored entry is also
+    written to disk, so a restarted process starts out warm.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, directory: str | None = None) -> None:
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    async def get(self, url: str) -> CacheEntry | None:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+            return entry
+        entry = await self._read(url)
+        if entry is None:
+            return None
+        # A response stored while the file was read is newer than the file
+        if url in self._entries:
+            return self._entries[url]
+        self._insert(entry)
+        return entry
+
+    async def store(self, url: str, data: Any, etag: str | None = None, last_modified: str | None = None) -> CacheEntry:
+        entry = CacheEntry(url, data, time.time(), get_ttl(url), etag, last_modified)
+        self._insert(entry)
+        await self._write(entry)
+        return entry
+
+    async def refresh(self, entry: CacheEntry) -> None:
+        """Mark a revalidated entry as fresh again"""
+        entry.stored_at = time.time()
+        await self._write(entry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _insert(self, entry: CacheEntry) -> None:
+        self._entries[entry.url] = entry
+        self._entries.move_to_end(entry.url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_path(self, url: str) -> str | None:
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    async def _read(self, url: str) -> CacheEntry | None:
+        """Load the entry from a worker thread, like `_write` saves it"""
+        if not self.directory:
+            return None
+        return await asyncio.to_thread(self._load, url)
+
+    def _load(self, url: str) -> CacheEntry | None:
+        path = self._get_path(url)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                entry = CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            logger.warning(f"Ignoring unreadable cache file: {path}", exc_info=True)
+            return None
+        return entry if entry.url == url else None
+
+    async def _write(self, entry: CacheEntry) -> None:
+        """Save the entry from a worker thread, game details are big enough to stall the event loop"""
+        if self.directory:
+            await asyncio.to_thread(self._save, entry)
+
+    def _save(self, entry: CacheEntry) -> None:
+        path = self._get_path(entry.url)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning(f"Unable to write cache file: {path}", exc_info=True)
+
+
+response_cache: Final = ResponseCache(directory=NFL_CACHE_DIRECTORY)
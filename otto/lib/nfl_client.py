@@ -1,68 +1,73 @@
-import operator
-import re
+from collections.abc import Sequence
 from typing import Any, Final
 
-import requests
+from aiohttp import ClientResponse
+from yarl import URL
 
 from otto import TEAM_NAME
+from otto.lib.nfl_auth import TokenManager
+from otto.lib.nfl_cache import ResponseCache, response_cache
+from otto.lib.nfl_queries import (
+    GAME_DETAILS_QUERY,
+    GAME_QUERY,
+    SCHEDULE_QUERY,
+    SCORES_QUERY,
+    STANDINGS_QUERY,
+    STAT_LEADER_QUERY,
+    STAT_LEADERS_QUERY,
+    Fragment,
+)
+from otto.lib.nfl_stream import GameDetailStream
 from otto.models.game import Game
 from otto.models.record import Record
+from otto.models.standings import StandingsTable
+from otto.utils.http import get_session, run_sync
 
 API_URL: Final = "https://api.nfl.com"
+STAT_LEADERS_PAGE_SIZE: Final = 250
+SCHEDULE_PAGE_SIZE: Final = 500
+
+nfl_token_manager: Final = TokenManager(API_URL + "/v1/reroute")
 
 
 class NFLClient:
-    _token: str | None = None
+    def __init__(
+        self,
+        cache: ResponseCache | None = response_cache,
+        token_manager: TokenManager = nfl_token_manager,
+    ) -> None:
+        self._cache = cache
+        self._token_manager = token_manager
 
     def get_scores(self, team: str = TEAM_NAME) -> list[Game]:
-        data = self._get_api_data(
-            """
-              /v1/games?s={
-                "$query":{
-                  "week.season": 2021,
-                  "$or":[
-                    {"homeTeam.abbr":"%s"},
-                    {"visitorTeam.abbr":"%s"}
-                  ]
-                }
-              }&fs={
-                id,
-                gameTime,
-                week{
-                  season,
-                  seasonType,
-                  week
-                },
-                homeTeam{
-                  id,
-                  abbr,
-                  nickName
-                },
-                visitorTeam{
-                  id,
-                  abbr,
-                  nickName
-                },
-                homeTeamScore{
-                  pointsTotal
-                },
-                visitorTeamScore{
-                  pointsTotal
-                },
-                gameStatus{
-                  phase
-                },
-                venue{
-                  name,
-                  location
-                },
-                networkChannels
-              }
-            """  # noqa: UP031
-            % (team, team)
-        )
+        return run_sync(self.fetch_scores(team))
+
+    async def fetch_scores(self, team: str = TEAM_NAME) -> list[Game]:
+        data = await self._fetch_api_data(SCORES_QUERY.bind(team=team))
 
-        return [Game.from_nfl_dict(game_data) for game_data in data["data"]]
+        return [Game.from_nfl_dict(game_data, team) for game_data in data["data"]]
+
+    def get_schedule(self, season: str = "2021") -> list[dict[str, Any]]:
+        return run_sync(self.fetch_schedule(season))
+
+    async def fetch_schedule(self, season: str = "2021") -> list[dict[str, Any]]:
+        """
+        Fetch every game of the season for the whole league.
+
+        The raw game data is returned, each team's view of a game is built
+        from it with `Game.from_nfl_dict(data, team)`.
+        """
+        games: list[dict[str, Any]] = []
+        while True:
+            data = await self._fetch_api_data(
+                SCHEDULE_QUERY.bind(season=int(season), take=SCHEDULE_PAGE_SIZE, skip=len(games))
+            )
+            page = data["data"]
+            games.extend(page)
+            # Pages are sorted by id so they don't overlap, a short page is the last one
+            if len(page) < SCHEDULE_PAGE_SIZE or len(games) >= int(data.get("pager", {}).get("total", 0)):
+                break
+        return games
 
     def get_stat_leader(
         self,
@@ -71,28 +76,23 @@ class NFLClient:
         season: str = "2021",
         season_type: str = "REG",
     ) -> str:
-        stat_query = stat.replace(".", "{") + "}"
-        data = self._get_api_data(
-            """
-            /v1/playerTeamStats?s={
-              "$query":{
-                "season":%s,
-                "seasonType":"%s",
-                "team.abbr":"%s"
-              },"$sort":{
-                "%s":1
-              },
-              "$take":10,
-              "$skip":0
-            }&fs={
-              person{
-                firstName,
-                lastName,
-              },
-              %s,
-            }
-          """  # noqa: UP031
-            % (season, season_type, team, stat, stat_query)
+        return run_sync(self.fetch_stat_leader(stat, team, season, season_type))
+
+    async def fetch_stat_leader(
+        self,
+        stat: str = "passing.yards",
+        team: str = TEAM_NAME,
+        season: str = "2021",
+        season_type: str = "REG",
+    ) -> str:
+        data = await self._fetch_api_data(
+            STAT_LEADER_QUERY.bind(
+                season=int(season),
+                season_type=season_type,
+                team=team,
+                stat=stat,
+                projection=Fragment(self._get_stats_projection([stat])),
+            )
         )
         result = ""
         if data["data"]:
@@ -108,6 +108,73 @@ class NFLClient:
 
         return result
 
+    def get_stat_leaders(
+        self,
+        stats: Sequence[str],
+        teams: Sequence[str],
+        season: str = "2021",
+        season_type: str = "REG",
+    ) -> dict[str, dict[str, str]]:
+        return run_sync(self.fetch_stat_leaders(stats, teams, season, season_type))
+
+    async def fetch_stat_leaders(
+        self,
+        stats: Sequence[str],
+        teams: Sequence[str],
+        season: str = "2021",
+        season_type: str = "REG",
+    ) -> dict[str, dict[str, str]]:
+        """
+        Fetch the leaders of every stat for every team in as few requests as the pager allows.
+
+        result example: { "CLE": { "passing.yards": "Baker Mayfield" } }
+        """
+        players: list[dict[str, Any]] = []
+        while True:
+            data = await self._fetch_api_data(
+                STAT_LEADERS_QUERY.bind(
+                    season=int(season),
+                    season_type=season_type,
+                    teams=teams,
+                    take=STAT_LEADERS_PAGE_SIZE,
+                    skip=len(players),
+                    projection=Fragment(self._get_stats_projection(stats)),
+                )
+            )
+            page = data["data"]
+            players.extend(page)
+            # Pages are sorted by id so they don't overlap, a short page is the last one
+            if len(page) < STAT_LEADERS_PAGE_SIZE or len(players) >= int(data.get("pager", {}).get("total", 0)):
+                break
+
+        team_players: dict[str, list[dict[str, Any]]] = {team: [] for team in teams}
+        for player in players:
+            abbr = player.get("team", {}).get("abbr")
+            if abbr in team_players:
+                team_players[abbr].append(player)
+
+        return {team: {stat: self._get_leader_names(stat, team_players[team]) for stat in stats} for team in teams}
+
+    def _get_stats_projection(self, stats: Sequence[str]) -> str:
+        """
+        stats example: ["passing.yards", "defensive.sacks", "defensive.interceptions"]
+        projection example: "passing{yards},defensive{sacks,interceptions}"
+        """
+        groups: dict[str, list[str]] = {}
+        for stat in stats:
+            group, _, field = stat.partition(".")
+            groups.setdefault(group, []).append(field)
+        return ",".join(group + "{" + ",".join(fields) + "}" for group, fields in groups.items())
+
+    def _get_leader_names(self, stat: str, players: list[dict[str, Any]]) -> str:
+        top_stat_value = max((self._get_stat_value(stat, player) for player in players), default=0)
+        names = []
+        for player in players:
+            stat_value = self._get_stat_value(stat, player)
+            if stat_value and top_stat_value <= stat_value:
+                names.append(player["person"]["firstName"] + " " + player["person"]["lastName"])
+        return ", ".join(names)
+
     def _get_stat_value(self, stat: str, player: dict[str, Any]) -> int:
         """
         stat example: "passing.yards", "defensive.interceptions"
@@ -138,332 +205,94 @@ class NFLClient:
     #     return res.status_code
 
     def get_game(self, game_id: str) -> Any:
-        data = self._get_api_data(
-            """
-              /v3/shield/?variables=null&query=query{
-                viewer{
-                  game(
-                    id:"%s"
-                  ){
-                    id,
-                    networkChannels,
-                    gameTime,
-                    awayTeam{
-                      id,
-                      abbreviation,
-                      fullName,
-                      nickName,
-                      cityStateRegion,
-                      franchise{
-                        id,
-                        currentLogo{
-                          url
-                        }
-                      }
-                    }
-                    homeTeam{
-                      id,
-                      abbreviation,
-                      fullName,
-                      nickName,
-                      cityStateRegion,
-                      franchise{
-                        id,
-                        currentLogo{
-                          url
-                        }
-                      }
-                    }
-                    week{
-                      seasonValue,
-                      id,
-                      seasonType,
-                      weekValue,
-                      weekType
-                    }
-                    radioLinks,
-                    ticketUrl,
-                    venue{
-                      fullName,
-                      city,
-                      state
-                    }
-                    gameDetailId
-                  }
-                }
-              }
-            """  # noqa: UP031
-            % (game_id)
-        )
+        return run_sync(self.fetch_game(game_id))
+
+    async def fetch_game(self, game_id: str) -> Any:
+        data = await self._fetch_api_data(GAME_QUERY.bind(game_id=game_id))
         return data["data"]["viewer"]["game"]
 
     def get_game_details(self, id: str) -> Any:
-        data = self._get_api_data(
-            """
-          /v3/shield/?variables=null&query=query{
-            viewer{
-              gameDetail(id:"%s"){
-                id,
-                attendance,
-                distance,
-                down,
-                gameClock,
-                goalToGo,
-                homePointsOvertime,
-                homePointsTotal,
-                homePointsQ1,
-                homePointsQ2,
-                homePointsQ3,
-                homePointsQ4,
-                homeTeam{
-                  abbreviation,
-                  nickName
-                },
-                homeTimeoutsUsed,
-                homeTimeoutsRemaining,
-                period,
-                phase,
-                playReview,
-                possessionTeam{
-                  abbreviation,
-                  nickName
-                },
-                redzone,
-                scoringSummaries{
-                  playId,
-                  playDescription,
-                  patPlayId,
-                  homeScore,
-                  visitorScore
-                },
-                stadium,
-                startTime,
-                visitorPointsOvertime,
-                visitorPointsOvertimeTotal,
-                visitorPointsQ1,
-                visitorPointsQ2,
-                visitorPointsQ3,
-                visitorPointsQ4,
-                visitorPointsTotal,
-                visitorTeam{
-                  abbreviation,
-                  nickName
-                },
-                visitorTimeoutsUsed,
-                visitorTimeoutsRemaining,
-                homePointsOvertimeTotal,
-                visitorPointsOvertimeTotal,
-                possessionTeam{
-                  nickName
-                },
-                weather{
-                  currentFahrenheit,
-                  location,
-                  longDescription,
-                  shortDescription,
-                  currentRealFeelFahrenheit,
-                }
-                yardLine,
-                yardsToGo,
-                drives{
-                  quarterStart,
-                  endTransition,
-                  endYardLine,
-                  endedWithScore,
-                  firstDowns,
-                  gameClockEnd,
-                  gameClockStart,
-                  howEndedDescription,
-                  howStartedDescription,
-                  inside20,
-                  orderSequence,
-                  playCount,
-                  playIdEnded,
-                  playIdStarted,
-                  playSeqEnded,
-                  playSeqStarted,
-                  possessionTeam{
-                    abbreviation,
-                    nickName,
-                    franchise{
-                      currentLogo{
-                        url,
-                      },
-                    },
-                  },
-                  quarterEnd,
-                  realStartTime,
-                  startTransition,
-                  startYardLine,
-                  timeOfPossession,
-                  yards,
-                  yardsPenalized
-                },
-                plays{
-                  clockTime,
-                  down,
-                  driveNetYards,
-                  drivePlayCount,
-                  driveSequenceNumber,
-                  driveTimeOfPossession,
-                  endClockTime,
-                  endYardLine,
-                  firstDown,
-                  goalToGo,
-                  nextPlayIsGoalToGo,
-                  nextPlayType,
-                  orderSequence,
-                  penaltyOnPlay,
-                  playClock,
-                  playDeleted,
-                  playDescription,
-                  playDescriptionWithJerseyNumbers,
-                  playId,
-                  playReviewStatus,
-                  isBigPlay,
-                  playType,
-                  playStats{
-                    statId,
-                    yards,
-                    team{
-                      id,
-                      abbreviation
-                    },
-                    playerName,
-                    gsisPlayer{ id }
-                  }
-                  possessionTeam{
-                    abbreviation,
-                    nickName,
-                    franchise{
-                      currentLogo{
-                        url,
-                      }
-                    }
-                  }
-                  prePlayByPlay,
-                  quarter,
-                  scoringPlay,
-                  scoringPlayType,
-                  scoringTeam{
-                    id,
-                    abbreviation,
-                    nickName
-                  },
-                  shortDescription,
-                  specialTeamsPlay,
-                  stPlayType,
-                  timeOfDay,
-                  yardLine,
-                  yards,
-                  yardsToGo,
-                  latestPlay
-                }
-              }
-            }
-          }
-       """  # noqa: UP031
-            % (id)
-        )
+        return run_sync(self.fetch_game_details(id))
+
+    async def fetch_game_details(self, id: str) -> Any:
+        data = await self._fetch_api_data(GAME_DETAILS_QUERY.bind(game_detail_id=id))
         return data
 
+    def stream_game_details(self, id: str, after_play: float = -1.0, after_drive: float = -1.0) -> GameDetailStream:
+        """
+        Stream the drives and plays of a game detail instead of loading the whole document.
+
+        Only drives and plays with an orderSequence after `after_drive` and `after_play` are yielded.
+
+        usage example:
+            async with client.stream_game_details(id, after_play=last_seen) as stream:
+                async for item in stream:
+                    ...
+        """
+        url = API_URL + GAME_DETAILS_QUERY.bind(game_detail_id=id)
+        return GameDetailStream(lambda: self._open_api_request(url), after_play, after_drive)
+
     def get_standings(
         self,
         year: str = "2021",
         teams: list[str] | None = None,
         division: str = "AFC_NORTH",
     ) -> list[Record]:
-        data = self._get_api_data(
-            """
-              /v3/shield/?variables=null&query=query{
-                viewer{
-                  standings(
-                    first:1,
-                    orderBy:week__weekValue,
-                    orderByDirection:DESC,
-                    week_seasonValue:%s,
-                    week_seasonType:REG,
-                  ){
-                    edges{
-                      cursor
-                      node{
-                        id
-                        teamRecords{
-                          conference
-                          division
-                          fullName
-                          nickName
-                          overallWin
-                          overallLoss
-                          overallTie
-                          overallPct
-                          overallPtsFor
-                          overallPtsAgainst
-                          homeWin
-                          homeLoss
-                          homeTie
-                          homePct
-                          roadWin
-                          roadLoss
-                          roadTie
-                          roadPct
-                          divisionWin
-                          divisionLoss
-                          divisionTie
-                          divisionPct
-                          divisionRank
-                          conferenceWin
-                          conferenceLoss
-                          conferenceTie
-                          conferencePct
-                          conferenceRank
-                          overallStreak
-                          clinchDivision
-                          clinchDivisionAndHomefield
-                          clinchPlayoff
-                          clinchWc
-                          eliminatedFromPostseason
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            """  # noqa: UP031
-            % (year)
-        )
-        edges = data["data"]["viewer"]["standings"]["edges"]
-        team_records = edges[0]["node"]["teamRecords"] if edges else []
-        records = [Record(team_record) for team_record in team_records]
+        return run_sync(self.fetch_standings(year, teams, division))
+
+    async def fetch_standings(
+        self,
+        year: str = "2021",
+        teams: list[str] | None = None,
+        division: str = "AFC_NORTH",
+    ) -> list[Record]:
+        table = await self.fetch_standings_table(year)
         if teams:
-            records = [record for record in records if record.abbr in teams]
+            return table.get_records(row for row, abbr in enumerate(table.abbrs) if abbr in teams)
         elif division:
-            records = [record for record in records if record.division == division]
-            records.sort(key=operator.attrgetter("division_rank"))
-        return records
-
-    def _get_api_data(self, url: str) -> Any:
-        url = API_URL + re.sub(r"[\n\s]+", " ", url).strip()
-        res = requests.get(url=url, headers={"Authorization": "Bearer " + self._get_client_token()})
-        try:
-            return res.json()
-        except:
-            print(url)
-            print(res.text)
-            raise
-
-    def _get_client_token(self, refresh: bool = False) -> str:
-        if not refresh and self._token:
-            return self._token
-
-        url = API_URL + "/v1/reroute"
-
-        res = requests.post(
-            url=url,
-            data={"grant_type": "client_credentials"},
-            headers={"X-Domain-Id": "100"},
-        )
+            return table.get_records(table.get_division(division))
+        return table.get_records(range(len(table)))
+
+    def get_standings_table(self, year: str = "2021") -> StandingsTable:
+        return run_sync(self.fetch_standings_table(year))
+
+    async def fetch_standings_table(self, year: str = "2021") -> StandingsTable:
+        data = await self._fetch_api_data(STANDINGS_QUERY.bind(season=int(year)))
+        edges = data["data"]["viewer"]["standings"]["edges"]
+        return StandingsTable(edges[0]["node"]["teamRecords"] if edges else [])
+
+    async def _fetch_api_data(self, query: str) -> Any:
+        url = API_URL + query
+        entry = await self._cache.get(url) if self._cache else None
+        if entry and entry.is_fresh:
+            return entry.data
+
+        res = await self._open_api_request(url, entry.validators if entry else {})
+        async with res:
+            if entry and self._cache and res.status == 304:
+                await self._cache.refresh(entry)
+                return entry.data
+            try:
+                data = await res.json(content_type=None)
+            except:
+                print(url)
+                print(await res.text())
+                raise
+
+            if self._cache and res.status == 200:
+                await self._cache.store(url, data, res.headers.get("ETag"), res.headers.get("Last-Modified"))
+            return data
+
+    async def _open_api_request(self, url: str, validators: dict[str, str] | None = None) -> ClientResponse:
+        token = await self._token_manager.get_token()
+        res = await self._request(url, token, validators or {})
+        if res.status == 401:
+            # The token expired or was revoked, refresh it once and retry
+            res.release()
+            token = await self._token_manager.refresh(stale_token=token)
+            res = await self._request(url, token, validators or {})
+        return res
 
-        self._token = res.json()["access_token"]
-        assert isinstance(self._token, str)
-        return self._token
+    async def _request(self, url: str, token: str, validators: dict[str, str]) -> ClientResponse:
+        headers = {"Authorization": "Bearer " + token, **validators}
+        return await get_session().get(URL(url, encoded=True), headers=headers)
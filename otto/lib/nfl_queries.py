@@ -0,0 +1,478 @@
+import json
+import re
+import urllib.parse
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Final
+
+# Characters left as-is when url encoding a query's own text, matching how requests sent the queries before.
+# Bound values escape all of them, so a value can't end the query string or add a parameter.
+QUERY_SAFE_CHARS: Final = "/?=&$:,()*!'@;+"
+
+placeholder_re: Final = re.compile(r"%\((\w+)\)s")
+
+
+@dataclass(frozen=True)
+class Fragment:
+    """Trusted piece of query syntax that is bound without escaping, like a field projection"""
+
+    text: str
+
+
+QueryValue = str | int | Sequence[str] | Fragment
+
+
+def minify(query: str) -> str:
+    return re.sub(r"[\n\s]+", " ", query).strip()
+
+
+def encode(text: str) -> str:
+    return urllib.parse.quote(text, safe=QUERY_SAFE_CHARS)
+
+
+def encode_value(value: QueryValue) -> str:
+    """Encode a bound value as a JSON literal, which is also a valid GraphQL literal"""
+    if isinstance(value, Fragment):
+        return encode(value.text)
+    elif isinstance(value, str | int):
+        return urllib.parse.quote(json.dumps(value), safe="")
+    return urllib.parse.quote(json.dumps(list(value)), safe="")
+
+
+class QueryTemplate:
+    """
+    NFL API query that is minified and url encoded once, when it is registered.
+
+    Values are bound to the `%(name)s` placeholders as escaped JSON literals.
+    """
+
+    __slots__ = ("name", "_segments", "_params")
+
+    def __init__(self, name: str, query: str) -> None:
+        self.name = name
+        pieces = placeholder_re.split(minify(query))
+        self._segments = [encode(segment) for segment in pieces[0::2]]
+        self._params = pieces[1::2]
+
+    def bind(self, **values: QueryValue) -> str:
+        parts = [self._segments[0]]
+        for param, segment in zip(self._params, self._segments[1:]):
+            parts.append(encode_value(values[param]))
+            parts.append(segment)
+        return "".join(parts)
+
+
+QUERY_TEMPLATES: Final[dict[str, QueryTemplate]] = {}
+
+
+def register(name: str, query: str) -> QueryTemplate:
+    template = QueryTemplate(name, query)
+    QUERY_TEMPLATES[name] = template
+    return template
+
+
+GAME_FIELDS: Final = """
+  id,
+  gameTime,
+  week{
+    season,
+    seasonType,
+    week
+  },
+  homeTeam{
+    id,
+    abbr,
+    nickName
+  },
+  visitorTeam{
+    id,
+    abbr,
+    nickName
+  },
+  homeTeamScore{
+    pointsTotal
+  },
+  visitorTeamScore{
+    pointsTotal
+  },
+  gameStatus{
+    phase
+  },
+  venue{
+    name,
+    location
+  },
+  networkChannels
+"""
+
+SCORES_QUERY: Final = register(
+    "scores",
+    """
+      /v1/games?s={
+        "$query":{
+          "week.season": 2021,
+          "$or":[
+            {"homeTeam.abbr":%(team)s},
+            {"visitorTeam.abbr":%(team)s}
+          ]
+        }
+      }&fs={"""
+    + GAME_FIELDS
+    + "}",
+)
+
+SCHEDULE_QUERY: Final = register(
+    "schedule",
+    """
+      /v1/games?s={
+        "$query":{
+          "week.season":%(season)s
+        },"$sort":{
+          "id":1
+        },
+        "$take":%(take)s,
+        "$skip":%(skip)s
+      }&fs={"""
+    + GAME_FIELDS
+    + "}",
+)
+
+
+STAT_LEADER_QUERY: Final = register(
+    "stat_leader",
+    """
+      /v1/playerTeamStats?s={
+        "$query":{
+          "season":%(season)s,
+          "seasonType":%(season_type)s,
+          "team.abbr":%(team)s
+        },"$sort":{
+          %(stat)s:1
+        },
+        "$take":10,
+        "$skip":0
+      }&fs={
+        person{
+          firstName,
+          lastName,
+        },
+        %(projection)s,
+      }
+    """,
+)
+
+
+STAT_LEADERS_QUERY: Final = register(
+    "stat_leaders",
+    """
+      /v1/playerTeamStats?s={
+        "$query":{
+          "season":%(season)s,
+          "seasonType":%(season_type)s,
+          "team.abbr":{"$in":%(teams)s}
+        },"$sort":{
+          "id":1
+        },
+        "$take":%(take)s,
+        "$skip":%(skip)s
+      }&fs={
+        person{
+          firstName,
+          lastName,
+        },
+        team{
+          abbr
+        },
+        %(projection)s,
+      }
+    """,
+)
+
+
+GAME_QUERY: Final = register(
+    "game",
+    """
+      /v3/shield/?variables=null&query=query{
+        viewer{
+          game(
+            id:%(game_id)s
+          ){
+            id,
+            networkChannels,
+            gameTime,
+            awayTeam{
+              id,
+              abbreviation,
+              fullName,
+              nickName,
+              cityStateRegion,
+              franchise{
+                id,
+                currentLogo{
+                  url
+                }
+              }
+            }
+            homeTeam{
+              id,
+              abbreviation,
+              fullName,
+              nickName,
+              cityStateRegion,
+              franchise{
+                id,
+                currentLogo{
+                  url
+                }
+              }
+            }
+            week{
+              seasonValue,
+              id,
+              seasonType,
+              weekValue,
+              weekType
+            }
+            radioLinks,
+            ticketUrl,
+            venue{
+              fullName,
+              city,
+              state
+            }
+            gameDetailId
+          }
+        }
+      }
+    """,
+)
+
+
+GAME_DETAILS_QUERY: Final = register(
+    "game_details",
+    """
+      /v3/shield/?variables=null&query=query{
+        viewer{
+          gameDetail(id:%(game_detail_id)s){
+            id,
+            attendance,
+            distance,
+            down,
+            gameClock,
+            goalToGo,
+            homePointsOvertime,
+            homePointsTotal,
+            homePointsQ1,
+            homePointsQ2,
+            homePointsQ3,
+            homePointsQ4,
+            homeTeam{
+              abbreviation,
+              nickName
+            },
+            homeTimeoutsUsed,
+            homeTimeoutsRemaining,
+            period,
+            phase,
+            playReview,
+            possessionTeam{
+              abbreviation,
+              nickName
+            },
+            redzone,
+            scoringSummaries{
+              playId,
+              playDescription,
+              patPlayId,
+              homeScore,
+              visitorScore
+            },
+            stadium,
+            startTime,
+            visitorPointsOvertime,
+            visitorPointsOvertimeTotal,
+            visitorPointsQ1,
+            visitorPointsQ2,
+            visitorPointsQ3,
+            visitorPointsQ4,
+            visitorPointsTotal,
+            visitorTeam{
+              abbreviation,
+              nickName
+            },
+            visitorTimeoutsUsed,
+            visitorTimeoutsRemaining,
+            homePointsOvertimeTotal,
+            visitorPointsOvertimeTotal,
+            possessionTeam{
+              nickName
+            },
+            weather{
+              currentFahrenheit,
+              location,
+              longDescription,
+              shortDescription,
+              currentRealFeelFahrenheit,
+            }
+            yardLine,
+            yardsToGo,
+            drives{
+              quarterStart,
+              endTransition,
+              endYardLine,
+              endedWithScore,
+              firstDowns,
+              gameClockEnd,
+              gameClockStart,
+              howEndedDescription,
+              howStartedDescription,
+              inside20,
+              orderSequence,
+              playCount,
+              playIdEnded,
+              playIdStarted,
+              playSeqEnded,
+              playSeqStarted,
+              possessionTeam{
+                abbreviation,
+                nickName,
+                franchise{
+                  currentLogo{
+                    url,
+                  },
+                },
+              },
+              quarterEnd,
+              realStartTime,
+              startTransition,
+              startYardLine,
+              timeOfPossession,
+              yards,
+              yardsPenalized
+            },
+            plays{
+              clockTime,
+              down,
+              driveNetYards,
+              drivePlayCount,
+              driveSequenceNumber,
+              driveTimeOfPossession,
+              endClockTime,
+              endYardLine,
+              firstDown,
+              goalToGo,
+              nextPlayIsGoalToGo,
+              nextPlayType,
+              orderSequence,
+              penaltyOnPlay,
+              playClock,
+              playDeleted,
+              playDescription,
+              playDescriptionWithJerseyNumbers,
+              playId,
+              playReviewStatus,
+              isBigPlay,
+              playType,
+              playStats{
+                statId,
+                yards,
+                team{
+                  id,
+                  abbreviation
+                },
+                playerName,
+                gsisPlayer{ id }
+              }
+              possessionTeam{
+                abbreviation,
+                nickName,
+                franchise{
+                  currentLogo{
+                    url,
+                  }
+                }
+              }
+              prePlayByPlay,
+              quarter,
+              scoringPlay,
+              scoringPlayType,
+              scoringTeam{
+                id,
+                abbreviation,
+                nickName
+              },
+              shortDescription,
+              specialTeamsPlay,
+              stPlayType,
+              timeOfDay,
+              yardLine,
+              yards,
+              yardsToGo,
+              latestPlay
+            }
+          }
+        }
+      }
+    """,
+)
+
+
+STANDINGS_QUERY: Final = register(
+    "standings",
+    """
+      /v3/shield/?variables=null&query=query{
+        viewer{
+          standings(
+            first:1,
+            orderBy:week__weekValue,
+            orderByDirection:DESC,
+            week_seasonValue:%(season)s,
+            week_seasonType:REG,
+          ){
+            edges{
+              cursor
+              node{
+                id
+                teamRecords{
+                  conference
+                  division
+                  fullName
+                  nickName
+                  overallWin
+                  overallLoss
+                  overallTie
+                  overallPct
+                  overallPtsFor
+                  overallPtsAgainst
+                  homeWin
+                  homeLoss
+                  homeTie
+                  homePct
+                  roadWin
+                  roadLoss
+                  roadTie
+                  roadPct
+                  divisionWin
+                  divisionLoss
+                  divisionTie
+                  divisionPct
+                  divisionRank
+                  conferenceWin
+                  conferenceLoss
+                  conferenceTie
+                  conferencePct
+                  conferenceRank
+                  overallStreak
+                  clinchDivision
+                  clinchDivisionAndHomefield
+                  clinchPlayoff
+                  clinchWc
+                  eliminatedFromPostseason
+                }
+              }
+            }
+          }
+        }
+      }
+    """,
+)
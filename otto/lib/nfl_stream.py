@@ -0,0 +1,151 @@
+import codecs
+import json
+import re
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Final
+
+from aiohttp import ClientResponse
+
+STREAM_CHUNK_SIZE: Final = 16 * 1024
+# Longest text a split `"plays" : [` key could leave behind at the end of a chunk
+KEY_LOOKBEHIND: Final = 32
+
+array_key_re: Final = re.compile(r'"(drives|plays)"\s*:\s*\[')
+ITEM_SEPARATORS: Final = " \t\r\n,"
+
+ITEM_KINDS: Final = {"drives": "drive", "plays": "play"}
+
+
+@dataclass
+class GameDetailItem:
+    kind: str
+    data: dict[str, Any]
+
+    @property
+    def order_sequence(self) -> float:
+        return float(self.data.get("orderSequence") or 0)
+
+
+class GameDetailParser:
+    """
+    Incremental parser of a `gameDetail` response.
+
+    Text is fed in as it arrives. Each drive and play is decoded on its own as
+    soon as it is complete and handed back, the rest of the document is kept
+    as a skeleton with empty `drives` and `plays` arrays. Items at or before
+    the given order sequences are decoded and dropped straight away, so they
+    are never held in memory together.
+    """
+
+    def __init__(self, after_play: float = -1.0, after_drive: float = -1.0) -> None:
+        self._after = {"drive": after_drive, "play": after_play}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._skeleton: list[str] = []
+        self._kind: str | None = None
+
+    def feed(self, text: str) -> list[GameDetailItem]:
+        self._buffer += text
+        items: list[GameDetailItem] = []
+        while self._step(items):
+            pass
+        return items
+
+    def close(self) -> Any:
+        """Finish parsing and return the document without its drives and plays"""
+        if self._kind is not None:
+            raise ValueError(f"Game detail ended inside the {self._kind} array")
+        skeleton = "".join(self._skeleton) + self._buffer
+        self._skeleton.clear()
+        self._buffer = ""
+        return json.loads(skeleton)
+
+    def _step(self, items: list[GameDetailItem]) -> bool:
+        """Consume as much of the buffer as possible, returns False when more text is needed"""
+        if self._kind is None:
+            match = array_key_re.search(self._buffer)
+            if not match:
+                keep = max(len(self._buffer) - KEY_LOOKBEHIND, 0)
+                self._skeleton.append(self._buffer[:keep])
+                self._buffer = self._buffer[keep:]
+                return False
+            self._skeleton.append(self._buffer[: match.end()])
+            self._buffer = self._buffer[match.end() :]
+            self._kind = ITEM_KINDS[match[1]]
+            return True
+
+        start = len(self._buffer) - len(self._buffer.lstrip(ITEM_SEPARATORS))
+        if start == len(self._buffer):
+            self._buffer = ""
+            return False
+        if self._buffer[start] == "]":
+            self._skeleton.append("]")
+            self._buffer = self._buffer[start + 1 :]
+            self._kind = None
+            return True
+
+        try:
+            data, end = self._decoder.raw_decode(self._buffer, start)
+        except json.JSONDecodeError:
+            # The item is not complete yet
+            self._buffer = self._buffer[start:]
+            return False
+
+        self._buffer = self._buffer[end:]
+        item = GameDetailItem(self._kind, data)
+        if item.order_sequence > self._after[item.kind]:
+            items.append(item)
+        return True
+
+
+class GameDetailStream:
+    """
+    Async iterator over the new drives and plays of a `gameDetail` response.
+
+    Breaking out of the iteration early stops reading the response. Once the
+    iteration is exhausted, `detail` holds the rest of the game detail.
+    """
+
+    def __init__(
+        self,
+        open_response: Callable[[], Awaitable[ClientResponse]],
+        after_play: float = -1.0,
+        after_drive: float = -1.0,
+    ) -> None:
+        self._open_response = open_response
+        self._parser = GameDetailParser(after_play, after_drive)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._response: ClientResponse | None = None
+        self._pending: deque[GameDetailItem] = deque()
+        self._done = False
+        self.detail: Any = None
+
+    async def __aenter__(self) -> "GameDetailStream":
+        self._response = await self._open_response()
+        self._response.raise_for_status()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        if self._response is not None:
+            self._response.release()
+            self._response = None
+
+    def __aiter__(self) -> "GameDetailStream":
+        return self
+
+    async def __anext__(self) -> GameDetailItem:
+        assert self._response, "GameDetailStream must be used with `async with`"
+        while not self._pending:
+            if self._done:
+                raise StopAsyncIteration
+            chunk = await self._response.content.read(STREAM_CHUNK_SIZE)
+            if chunk:
+                self._pending.extend(self._parser.feed(self._text_decoder.decode(chunk)))
+            else:
+                self._parser.feed(self._text_decoder.decode(b"", final=True))
+                document = self._parser.close()
+                self.detail = document["data"]["viewer"]["gameDetail"]
+                self._done = True
+        return self._pending.popleft()
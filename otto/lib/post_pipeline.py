@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Final
+
+from asyncpraw.models import Submission
+
+from otto.lib.browser import PageWaitTimeoutError
+
+logger: Final = logging.getLogger(__name__)
+
+POST_WORKERS: Final = 4
+POST_QUEUE_SIZE: Final = 100
+# Seconds a single post can take before its check is cancelled
+POST_TIMEOUT: Final = 120.0
+# Checks of a post before giving up on it, and seconds before each retry times the attempts so far
+POST_ATTEMPTS: Final = 3
+POST_RETRY_DELAY: Final = 30.0
+
+
+@dataclass
+class PipelineStats:
+    """Counters of a post pipeline, lag is the seconds between a post being submitted and being checked"""
+
+    queued: int = 0
+    checked: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    retried: int = 0
+    given_up: int = 0
+    # Checks that gave up waiting for a free browser page
+    page_wait_timeouts: int = 0
+    # Times the stream was paused by a full queue
+    stalls: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    last_wait: float = 0.0
+
+
+class PostPipeline:
+    """
+    Bounded queue of posts checked by a fixed number of workers.
+
+    `put` waits while the queue is full, which pauses the stream feeding it
+    instead of piling up posts in memory. Each check runs with its own
+    timeout, and checks of the same post never run at the same time, so the
+    mod actions on a post keep their order. A check that fails is queued
+    again after a delay, and `on_give_up` is called once a post has failed
+    `attempts` times.
+
+    example:
+        async with PostPipeline(check) as pipeline:
+            async for post in sr.stream.submissions():
+                await pipeline.put(post)
+    """
+
+    def __init__(
+        self,
+        check: Callable[[Submission], Awaitable[None]],
+        workers: int = POST_WORKERS,
+        max_size: int = POST_QUEUE_SIZE,
+        timeout: float = POST_TIMEOUT,
+        attempts: int = POST_ATTEMPTS,
+        retry_delay: float = POST_RETRY_DELAY,
+        on_give_up: Callable[[Submission], None] | None = None,
+    ) -> None:
+        self.check = check
+        self.workers = workers
+        self.timeout = timeout
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self.on_give_up = on_give_up
+        self.stats = PipelineStats()
+        # Posts with the time they were queued and the number of checks that failed before
+        self._queue: asyncio.Queue[tuple[Submission, float, int]] = asyncio.Queue(max_size)
+        self._retries: set[asyncio.Task[None]] = set()
+        # Lock of each post being checked, with the number of workers holding or waiting for it
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stalled_at: float | None = None
+
+    async def __aenter__(self) -> "PostPipeline":
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            # Posts already taken from the stream are still checked when the stream fails
+            if exc_type is None or issubclass(exc_type, Exception):
+                await self._queue.join()
+                while self._retries:
+                    await asyncio.gather(*self._retries)
+                    await self._queue.join()
+        finally:
+            tasks = [*self._tasks, *self._retries]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks = []
+            self._retries.clear()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def put(self, post: Submission) -> None:
+        # A stall lasts until a post goes in without waiting, it's only logged when it starts and ends
+        if self._queue.full():
+            if self._stalled_at is None:
+                self._stalled_at = time.monotonic()
+                self.stats.stalls += 1
+                logger.warning(f"Post queue is full ({self.depth}), pausing the stream")
+        elif self._stalled_at is not None:
+            logger.info(
+                f"Post queue has room again, the stream was paused for {time.monotonic() - self._stalled_at:.1f}s"
+            )
+            self._stalled_at = None
+        await self._queue.put((post, time.monotonic(), 0))
+        self.stats.queued += 1
+        self.stats.depth = self.depth
+        self.stats.max_depth = max(self.stats.max_depth, self.stats.depth)
+
+    async def _work(self) -> None:
+        while True:
+            post, queued_at, failures = await self._queue.get()
+            try:
+                if not await self._check(post, queued_at):
+                    self._fail(post, failures + 1)
+            finally:
+                self._queue.task_done()
+
+    def _fail(self, post: Submission, failures: int) -> None:
+        if failures >= self.attempts:
+            self.stats.given_up += 1
+            logger.error(f"Giving up on post {post.id} after {failures} failed checks")
+            if self.on_give_up:
+                self.on_give_up(post)
+            return
+        self.stats.retried += 1
+        task = asyncio.create_task(self._retry(post, failures))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _retry(self, post: Submission, failures: int) -> None:
+        # Retries wait for room in the queue like new posts, outside of the workers
+        await asyncio.sleep(self.retry_delay * failures)
+        await self._queue.put((post, time.monotonic(), failures))
+
+    async def _check(self, post: Submission, queued_at: float) -> bool:
+        """Check a post, returns whether the check succeeded"""
+        lock, users = self._locks.get(post.id, (asyncio.Lock(), 0))
+        self._locks[post.id] = (lock, users + 1)
+        try:
+            async with lock:
+                stats = self.stats
+                stats.depth = self.depth
+                stats.last_wait = time.monotonic() - queued_at
+                stats.last_lag = max(time.time() - post.created_utc, 0.0)
+                stats.max_lag = max(stats.max_lag, stats.last_lag)
+                logger.info(
+                    f"Post {post.id}: lag {stats.last_lag:.1f}s, queued {stats.last_wait:.1f}s, "
+                    f"queue depth {stats.depth}"
+                )
+                deadline = asyncio.timeout(self.timeout)
+                try:
+                    async with deadline:
+                        await self.check(post)
+                    stats.checked += 1
+                    return True
+                except PageWaitTimeoutError as e:
+                    stats.page_wait_timeouts += 1
+                    logger.warning(f"Unable to check post {post.id}: {e}")
+                except TimeoutError:
+                    if deadline.expired():
+                        stats.timed_out += 1
+                        logger.warning(f"Checking post {post.id} took longer than {self.timeout:.0f}s, skipped")
+                    else:
+                        stats.failed += 1
+                        logger.exception(f"Unable to check post {post.id}")
+                except Exception:
+                    stats.failed += 1
+                    logger.exception(f"Unable to check post {post.id}")
+                return False
+        finally:
+            lock, users = self._locks[post.id]
+            if users > 1:
+                self._locks[post.id] = (lock, users - 1)
+            else:
+                del self._locks[post.id]
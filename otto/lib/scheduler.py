@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import random
+from collections.abc import Callable, Coroutine, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Final
+
+from otto.models.game import Game
+from otto.utils import get_now
+
+logger: Final = logging.getLogger(__name__)
+
+LIVE_PHASES: Final = frozenset({"INGAME", "HALFTIME", "SUSPENDED"})
+FINAL_PHASES: Final = frozenset({"FINAL", "FINAL_OVERTIME", "CANCELLED"})
+# How long after kickoff a game that hasn't been marked final is still considered live
+GAME_LENGTH: Final = timedelta(hours=4)
+GAME_DAY_WINDOW: Final = timedelta(hours=12)
+SEASON_WINDOW: Final = timedelta(days=14)
+JITTER: Final = 0.1
+
+LIVE: Final = "live"
+GAME_DAY: Final = "game_day"
+SEASON: Final = "season"
+OFFSEASON: Final = "offseason"
+
+
+@dataclass(frozen=True)
+class Cadence:
+    """Seconds between runs of a job in every state of the season"""
+
+    live: float
+    game_day: float
+    season: float
+    offseason: float
+
+    def get_interval(self, state: str) -> float:
+        if state == LIVE:
+            return self.live
+        elif state == GAME_DAY:
+            return self.game_day
+        elif state == SEASON:
+            return self.season
+        return self.offseason
+
+
+def is_live(game: Game, now: datetime) -> bool:
+    if game.game_phase in LIVE_PHASES:
+        return True
+    return game.game_phase not in FINAL_PHASES and game.game_time <= now <= game.game_time + GAME_LENGTH
+
+
+def get_season_state(games: list[Game], now: datetime | None = None) -> str:
+    now = now or get_now()
+    state = OFFSEASON
+    for game in games:
+        if is_live(game, now):
+            return LIVE
+        distance = abs(game.game_time - now)
+        if distance <= GAME_DAY_WINDOW:
+            state = GAME_DAY
+        elif distance <= SEASON_WINDOW and state == OFFSEASON:
+            state = SEASON
+    return state
+
+
+def get_seconds_until_kickoff(games: list[Game], now: datetime | None = None) -> float | None:
+    now = now or get_now()
+    upcoming = [(game.game_time - now).total_seconds() for game in games if game.game_time > now]
+    return min(upcoming) if upcoming else None
+
+
+class JobScheduler:
+    """
+    Decide when each job runs next from the state of the season.
+
+    Every job has its own cadence. Intervals are jittered so jobs don't line
+    up with each other, and are cut short so a job always wakes up for the
+    next kickoff. A job that failed, or that doesn't know any games yet, is
+    retried at its live cadence, backing off up to its game day cadence.
+    """
+
+    def __init__(self, cadences: Mapping[str, Cadence], jitter: float = JITTER) -> None:
+        self.cadences = dict(cadences)
+        self.jitter = jitter
+        self.games: dict[str, list[Game]] = {}
+        # Runs in a row that failed or returned no games, by job
+        self.failures: dict[str, int] = {}
+
+    def get_interval(self, name: str, games: list[Game], now: datetime | None = None) -> float:
+        now = now or get_now()
+        interval = self.cadences[name].get_interval(get_season_state(games, now))
+        interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        until_kickoff = get_seconds_until_kickoff(games, now)
+        if until_kickoff is not None:
+            interval = min(interval, until_kickoff)
+        return max(interval, 1.0)
+
+    def get_retry_interval(self, name: str, failures: int) -> float:
+        cadence = self.cadences[name]
+        interval = min(cadence.live * 2.0 ** max(failures - 1, 0), max(cadence.game_day, cadence.live))
+        return max(interval * random.uniform(1 - self.jitter, 1 + self.jitter), 1.0)
+
+    async def run(self, run_jobs: Callable[[set[str]], Coroutine[Any, Any, Mapping[str, list[Game]]]]) -> None:
+        """
+        Run forever, calling `run_jobs` with the names of the jobs that are due.
+
+        `run_jobs` returns the current games of each job it ran, which decide the next intervals.
+        """
+        if not self.cadences:
+            return
+
+        loop = asyncio.get_running_loop()
+        next_runs = {name: loop.time() for name in self.cadences}
+        while True:
+            due = {name for name, next_run in next_runs.items() if next_run <= loop.time()}
+            if due:
+                results: Mapping[str, list[Game]] = {}
+                try:
+                    results = await run_jobs(due)
+                except Exception as e:
+                    logger.exception(e)
+                self.games.update(results)
+
+                for name in due:
+                    if results.get(name):
+                        self.failures.pop(name, None)
+                        interval = self.get_interval(name, self.games[name])
+                        logger.info(f"Next {name} run in {interval:.0f}s")
+                    else:
+                        failures = self.failures[name] = self.failures.get(name, 0) + 1
+                        interval = self.get_retry_interval(name, failures)
+                        logger.warning(f"Retrying {name} in {interval:.0f}s, {failures} failed runs in a row")
+                    next_runs[name] = loop.time() + interval
+
+            await asyncio.sleep(max(min(next_runs.values()) - loop.time(), 0))
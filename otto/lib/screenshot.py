@@ -2,9 +2,10 @@ import logging
 from pathlib import Path
 from typing import Any, Final
 
-from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from otto import TWITTER_AUTH_COOKIE
+from otto.lib.browser import MEDIA_RESOURCE_TYPES, BrowserProfile, browser_service
 
 COOKIES: Final[list[Any]] = [
     {
@@ -16,22 +17,33 @@ COOKIES: Final[list[Any]] = [
         "secure": True,
     },
 ]
+# Images and fonts show up in the screenshot, so only video, trackers and embedded frames are dropped
+SCREENSHOT_PROFILE: Final = BrowserProfile(
+    "screenshot",
+    cookies=COOKIES,
+    context_options={"color_scheme": "dark"},
+    blocked_resource_types=MEDIA_RESOURCE_TYPES,
+    block_trackers=True,
+    block_third_party_frames=True,
+)
+
+IMAGE_LOAD_TIMEOUT: Final = 5000
 
 logger: Final = logging.getLogger(__name__)
 
 
 async def screenshot_article(url: str, path: str | Path) -> bool:
     try:
-        async with async_playwright() as p:
-            browser = await p.firefox.launch()
-            context = await browser.new_context(color_scheme="dark")
-            await context.add_cookies(COOKIES)
-            page = await context.new_page()
-            await page.goto(url)
+        async with browser_service.lease(SCREENSHOT_PROFILE) as page:
+            await page.goto(url, wait_until="domcontentloaded")
             element = await page.wait_for_selector("article")
             assert element
+            try:
+                # Give the images in the article a moment to show up, without waiting on everything else
+                await page.wait_for_load_state("load", timeout=IMAGE_LOAD_TIMEOUT)
+            except PlaywrightTimeoutError:
+                pass
             await element.screenshot(path=path)
-            await browser.close()
             return True
     except Exception as e:
         logger.error("Error screenshotting article", exc_info=e)
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Final
+
+from asyncpraw.models import Submission
+from asyncpraw.models.reddit.subreddit import Subreddit
+
+from otto import STREAM_CHECKPOINT_FILE
+
+logger: Final = logging.getLogger(__name__)
+
+# Ids of checked posts remembered to skip them when the stream overlaps the backfill
+RECENT_SIZE: Final = 1000
+# Reddit doesn't list more than about 1000 posts of /new, fetched 100 per request
+BACKFILL_LIMIT: Final = 1000
+
+
+class StreamCheckpoint:
+    """
+    Last submission the post stream got through, kept on disk to resume the stream without gaps.
+
+    Posts are marked with `start` when they are queued and with `finish` once
+    checked, or once the pipeline gives up on them. The checkpoint only moves
+    past a post when every older post that was queued is finished too, so
+    posts still being checked or retried when otto stops are picked up again
+    by the next backfill.
+
+    checkpoint example: {"id": "qv2l4x", "created_utc": 1637452800.0, "recent": [["qv2l4x", 1637452800.0]]}
+    """
+
+    def __init__(self, path: str | None = None, recent_size: int = RECENT_SIZE) -> None:
+        self.path = path
+        self.recent_size = recent_size
+        self.id: str | None = None
+        self.created_utc: float | None = None
+        self._recent: OrderedDict[str, float] = OrderedDict()
+        self._pending: dict[str, float] = {}
+        self._loaded = False
+
+    def is_seen(self, id: str) -> bool:
+        """True when the post was checked recently or is being checked"""
+        self._load()
+        return id in self._recent or id in self._pending
+
+    def is_behind(self, post: Submission) -> bool:
+        """True when the post was submitted before the checkpoint"""
+        self._load()
+        return self.created_utc is not None and (post.id == self.id or post.created_utc < self.created_utc)
+
+    def should_check(self, post: Submission) -> bool:
+        return not self.is_seen(post.id) and not self.is_behind(post)
+
+    def start(self, post: Submission) -> None:
+        self._load()
+        self._pending[post.id] = post.created_utc
+
+    def finish(self, post: Submission) -> None:
+        self._load()
+        self._pending.pop(post.id, None)
+        self._recent[post.id] = post.created_utc
+        self._recent.move_to_end(post.id)
+        while len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+        self._advance()
+        self._save()
+
+    async def get_backfill(self, sr: Subreddit, limit: int = BACKFILL_LIMIT) -> list[Submission]:
+        """Posts of /new submitted since the checkpoint and not checked yet, oldest first"""
+        self._load()
+        if self.created_utc is None:
+            return []
+        posts: list[Submission] = []
+        async for post in sr.new(limit=limit):
+            if self.is_behind(post):
+                break
+            if not self.is_seen(post.id):
+                posts.append(post)
+        else:
+            logger.warning(f"Reached the end of /new before the checkpoint {self.id}, older posts are skipped")
+        posts.reverse()
+        return posts
+
+    def _advance(self) -> None:
+        """Move the checkpoint to the newest checked post older than every post still being checked"""
+        floor = min(self._pending.values(), default=None)
+        newest: tuple[float, str] | None = None
+        for id, created_utc in self._recent.items():
+            if (floor is None or created_utc < floor) and (newest is None or created_utc > newest[0]):
+                newest = (created_utc, id)
+        if newest is not None and (self.created_utc is None or newest[0] > self.created_utc):
+            self.created_utc, self.id = newest
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data["id"] is not None:
+                self.id = str(data["id"])
+                self.created_utc = float(data["created_utc"])
+            self._recent = OrderedDict((str(id), float(created_utc)) for id, created_utc in data["recent"])
+        except (OSError, ValueError, TypeError, KeyError):
+            logger.warning(f"Ignoring unreadable stream checkpoint file: {self.path}", exc_info=True)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"id": self.id, "created_utc": self.created_utc, "recent": list(self._recent.items())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.warning(f"Unable to write stream checkpoint file: {self.path}", exc_info=True)
+
+
+stream_checkpoint: Final = StreamCheckpoint(path=STREAM_CHECKPOINT_FILE)
@@ -1,10 +1,39 @@
+import asyncio
 import html
+import logging
 import re
-from typing import Any
-
-from playwright.async_api import async_playwright
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
 
 from otto import TWITTER_AUTH_COOKIE
+from otto.errors import TweetUnavailableError
+from otto.lib.browser import HEAVY_RESOURCE_TYPES, BrowserProfile, browser_service
+from otto.lib.post_pipeline import POST_WORKERS
+
+logger: Final = logging.getLogger(__name__)
+
+TWEET_CACHE_SIZE: Final = 1024
+TWEET_TTL: Final = 6 * 60 * 60.0
+# Deleted and protected tweets are checked again sooner, they may come back
+TWEET_MISSING_TTL: Final = 5 * 60.0
+
+# Where x.com explains why a tweet can't be shown, in place of the tweet
+UNAVAILABLE_SELECTOR: Final = '[data-testid="error-detail"], [data-testid="emptyState"]'
+UNAVAILABLE_MARKERS: Final = (
+    "this page doesn't exist",
+    "this post was deleted",
+    "this post is unavailable",
+    "this post is from a suspended account",
+    "this post is from an account that no longer exists",
+    "these posts are protected",
+    "this tweet was deleted",
+    "this tweet is unavailable",
+    "these tweets are protected",
+    "account suspended",
+    "this account doesn't exist",
+)
 
 twitter_status_url_re = re.compile(r".*https?:\/\/(mobile.)?(twitter|x)\.com\/(?:#!\/)?(\w+)\/status(es)?\/(\d+).*")
 truncated_tweet_re = re.compile(r"(.*?)(\…?\s*)https:\/\/t.co\/.*?$")
@@ -27,6 +56,16 @@ COOKIES: list[Any] = [
         "secure": True,
     },
 ]
+# Only the text of the tweet is read, so everything heavy is dropped. Every post worker can hold a page,
+# so a tweet that never loads doesn't leave the other workers waiting for one
+TWEET_PROFILE: Final = BrowserProfile(
+    "tweet",
+    cookies=COOKIES,
+    size=POST_WORKERS,
+    blocked_resource_types=HEAVY_RESOURCE_TYPES,
+    block_trackers=True,
+    block_third_party_frames=True,
+)
 
 
 def text_contains_twitter_status_url(text: str) -> tuple[bool, int | None, str | None]:
@@ -45,21 +84,109 @@ def clean_tweet(tweet: str) -> str:
     return html.unescape(tweet).replace("\n", " ").replace("  ", " ")
 
 
-async def get_tweet_text(status_id: int, author: str = "anyuser") -> str:
-    async with async_playwright() as p:
-        browser = await p.firefox.launch()
-        context = await browser.new_context()
-        await context.add_cookies(COOKIES)
-        page = await context.new_page()
+def is_unavailable_text(text: str) -> bool:
+    text = text.lower().replace("’", "'")
+    return any(marker in text for marker in UNAVAILABLE_MARKERS)
+
+
+async def fetch_tweet_text(status_id: int, author: str = "anyuser") -> str:
+    """
+    Read the text of a tweet from its page.
+
+    Raises TweetUnavailableError when x.com says the tweet is gone or hidden,
+    any other page that doesn't show the tweet fails like the page timing out.
+    """
+    async with browser_service.lease(TWEET_PROFILE) as page:
         tweet_url = get_tweet_url(status_id, author)
-        await page.goto(tweet_url)
-        await page.wait_for_selector("article")
-        element = page.get_by_test_id("tweetText")
-        assert element, "Tweet text element not found, div['data-testid=\"tweetText\"']"
-        text = await element.first.text_content()
-        await browser.close()
-        if text:
-            text = clean_tweet(text)
+        await page.goto(tweet_url, wait_until="commit")
+        await page.wait_for_selector(f"article, {UNAVAILABLE_SELECTOR}")
+
+        article = page.locator("article").first
+        if not await article.count():
+            message = await page.locator(UNAVAILABLE_SELECTOR).first.text_content() or ""
+            if is_unavailable_text(message):
+                raise TweetUnavailableError(f"Tweet {status_id}: {clean_tweet(message)}")
+            raise RuntimeError(f"Tweet {status_id} didn't load: {clean_tweet(message)}")
+
+        element = article.get_by_test_id("tweetText")
+        if await element.count():
+            text = await element.first.text_content()
+        elif is_unavailable_text(await article.text_content() or ""):
+            raise TweetUnavailableError(f"Tweet {status_id} is unavailable")
         else:
+            # Tweets of only a picture or a video have no text
             text = ""
-        return str(text)
+    if text:
+        text = clean_tweet(text)
+    else:
+        text = ""
+    return str(text)
+
+
+class TweetTextCache:
+    """
+    LRU cache of the cleaned text of tweets by status id.
+
+    Tweets that x.com says are gone or hidden, like deleted or protected ones,
+    are cached as empty text for a shorter time. Other failures, like a slow
+    page or a login wall, aren't cached. Concurrent lookups of the same status
+    share a single fetch.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, str], Awaitable[str]],
+        max_entries: int = TWEET_CACHE_SIZE,
+        ttl: float = TWEET_TTL,
+        missing_ttl: float = TWEET_MISSING_TTL,
+    ) -> None:
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self._entries: OrderedDict[int, tuple[str, float]] = OrderedDict()
+        self._in_flight: dict[int, asyncio.Task[str]] = {}
+
+    async def get(self, status_id: int, author: str = "anyuser") -> str:
+        entry = self._entries.get(status_id)
+        if entry is not None:
+            text, expires_at = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(status_id)
+                return text
+            del self._entries[status_id]
+
+        loop = asyncio.get_running_loop()
+        task = self._in_flight.get(status_id)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch(status_id, author))
+            self._in_flight[status_id] = task
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _fetch(self, status_id: int, author: str) -> str:
+        try:
+            try:
+                text = await self.fetch(status_id, author)
+            except TweetUnavailableError as e:
+                logger.info(f"{e}, caching it as empty")
+                text = ""
+            self._store(status_id, text)
+            return text
+        finally:
+            self._in_flight.pop(status_id, None)
+
+    def _store(self, status_id: int, text: str) -> None:
+        self._entries[status_id] = (text, time.time() + (self.ttl if text else self.missing_ttl))
+        self._entries.move_to_end(status_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+tweet_text_cache: Final = TweetTextCache(fetch_tweet_text)
+
+
+async def get_tweet_text(status_id: int, author: str = "anyuser") -> str:
+    return await tweet_text_cache.get(status_id, author)
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from typing import Final
 
@@ -6,9 +7,9 @@ from asyncpraw.models.reddit.subreddit import Subreddit, SubredditStylesheet
 from asyncpraw.reddit import Reddit
 
 from otto.config import Config
-from otto.models.game import Game, get_last_game, get_next_game
+from otto.models.game import Game, SeasonTimeline
 from otto.models.team import get_position, get_small_bw_icon_path, get_small_icon_path
-from otto.utils import get_url_age
+from otto.utils import get_now, get_url_age
 from otto.utils.css import (
     find_all_rules_by_classes,
     get_identity,
@@ -16,6 +17,7 @@ from otto.utils.css import (
     parse_stylesheet,
     serialize_stylesheet,
 )
+from otto.utils.reddit import call_with_backoff
 
 # Update old Reddit
 DOWNVOTE_UNVOTED_TOKEN: Final = "%%teamsmallfade%%"
@@ -26,8 +28,10 @@ DOWNVOTE_VOTED: Final = ".arrow.downmod"
 
 async def update_downvote(config: Config, reddit: Reddit, sr_name: str, games: list[Game]) -> None:
     sr = await reddit.subreddit(sr_name)
-    next_game = get_next_game(games, config.downvotes_delay)
-    last_game = get_last_game(games, config.downvotes_delay)
+    timeline = SeasonTimeline(games)
+    now = get_now()
+    next_game = timeline.get_next_game(config.downvotes_delay, now)
+    last_game = timeline.get_last_game(config.downvotes_delay, now)
     assert next_game
     next_team = next_game.opponent
     assert next_team
@@ -62,14 +66,26 @@ async def update_new_downvote(
         active_image_path = get_small_icon_path(next_abbr)
         inactive_image_path = get_small_bw_icon_path(next_abbr)
 
-        active_down_url = sr.stylesheet._upload_style_asset(active_image_path, "postDownvoteIconActive")
-        inactive_down_url = sr.stylesheet._upload_style_asset(inactive_image_path, "postDownvoteIconInactive")
-        sr.stylesheet._update_structured_styles(
-            {
-                "postVoteIcons": "custom",
-                "postDownvoteIconActive": active_down_url,
-                "postDownvoteIconInactive": inactive_down_url,
-            }
+        active_down_url, inactive_down_url = await asyncio.gather(
+            call_with_backoff(
+                lambda: sr.stylesheet._upload_style_asset(
+                    image_path=active_image_path, image_type="postDownvoteIconActive"
+                )
+            ),
+            call_with_backoff(
+                lambda: sr.stylesheet._upload_style_asset(
+                    image_path=inactive_image_path, image_type="postDownvoteIconInactive"
+                )
+            ),
+        )
+        await call_with_backoff(
+            lambda: sr.stylesheet._update_structured_styles(
+                {
+                    "postVoteIcons": "custom",
+                    "postDownvoteIconActive": active_down_url,
+                    "postDownvoteIconInactive": inactive_down_url,
+                }
+            )
         )
 
 
@@ -77,8 +93,8 @@ async def update_old_downvote(sr: Subreddit, team: str) -> None:
     assert sr, "`sr` wasn't specified"
     assert team, "`team` wasn't specified"
 
-    sr_stylesheet: SubredditStylesheet = sr.stylesheet()
-    styles = await sr_stylesheet()
+    sr_stylesheet: SubredditStylesheet = sr.stylesheet
+    styles = await call_with_backoff(sr_stylesheet)
     css: str = styles.stylesheet
 
     parsed = parse_stylesheet(css)
@@ -103,4 +119,4 @@ async def update_old_downvote(sr: Subreddit, team: str) -> None:
             background_image[0].value = DOWNVOTE_VOTED_TOKEN
 
     updated_css = serialize_stylesheet(parsed)
-    await sr_stylesheet.update(updated_css)
+    await call_with_backoff(lambda: sr_stylesheet.update(updated_css))
@@ -11,6 +11,7 @@ from discord.file import File
 
 from otto.utils import delete_file, download_image
 from otto.utils.image import resize_image
+from otto.utils.reddit import call_with_backoff
 
 SIDEBAR_TOKEN: Final = "sidebar"
 SIDEBAR_CSS_NAME: Final = "h1.redditname"
@@ -39,13 +40,13 @@ async def update_sidebar_image(reddit: Reddit, image_url: str, sr_name: str, ctx
 
 
 async def update_new_reddit_sidebar_image(sr: Subreddit, image_path: str, width: int, height: int) -> None:
-    widgets: SubredditWidgets = await sr.widgets
-    image_url = widgets.mod.upload_image(image_path)
+    widgets: SubredditWidgets = sr.widgets
+    image_url = await call_with_backoff(lambda: widgets.mod.upload_image(image_path))
     image_dicts = [{"width": width, "height": height, "linkUrl": "", "url": image_url}]
 
-    for widget in await widgets.sidebar():
+    async for widget in widgets.sidebar():
         if isinstance(widget, ImageWidget):
-            widget.mod.update(data=image_dicts)
+            await call_with_backoff(lambda: widget.mod.update(data=image_dicts))
             break
 
 
@@ -87,10 +88,10 @@ async def update_old_reddit_sidebar_image(sr: Subreddit, image_path: str, width:
     # Update old Reddit
 
     sr_stylesheet = sr.stylesheet
-    styles = sr_stylesheet.__call__()
+    styles = await call_with_backoff(sr_stylesheet)
     css = styles.stylesheet
 
-    sr_stylesheet.upload(SIDEBAR_TOKEN, image_path)
+    await call_with_backoff(lambda: sr_stylesheet.upload(name=SIDEBAR_TOKEN, image_path=image_path))
 
     parsed = tinycss2.parser.parse_stylesheet(css)
     for rule in parsed:
@@ -111,4 +112,4 @@ async def update_old_reddit_sidebar_image(sr: Subreddit, image_path: str, width:
                 _update_size_token(rule, "width", width_token_representation)
 
     updated_css = "".join([rule.serialize() for rule in parsed])
-    sr_stylesheet.update(updated_css)
+    await call_with_backoff(lambda: sr_stylesheet.update(updated_css))
@@ -1,14 +1,24 @@
+import asyncio
+import json
+import logging
 import re
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Final
 
+from asyncpraw.models.reddit.subreddit import Subreddit
+from asyncpraw.models.reddit.widgets import Widget
 from asyncpraw.reddit import Reddit
 
 from otto.config import Config
+from otto.lib.content_hashes import ContentHashStore, content_hashes
 from otto.models.game import Game
 from otto.models.record import Record
-from otto.models.team import get_name, get_subreddit
+from otto.models.team import get_division_short_name, get_name, get_subreddit
 from otto.utils import get_date, get_time
+from otto.utils.reddit import call_with_backoff
+
+logger: Final = logging.getLogger(__name__)
 
 spacer = "&nbsp;&nbsp;&nbsp;"
 season_table_header = f"""
@@ -19,36 +29,114 @@ standings_table_header = """
 ||**W-L**|**Home**|**Away**|**Div**|**Streak**|
 |:---:|:--:|:--:|:--:|:--:|:--:|
 """
+PRESEASON_WIDGET: Final = "Preseason Opponents"
 
-preseason_regex = re.compile(
-    r"""(
-#PRESEASON OPPONENTS\s*
-DATE\|OPPONENT\|TIME\|\s*
-\|:---:\|:--:\|:---:\|
-)(.|\s)*?(
--{3,})""",
-    re.DOTALL | re.IGNORECASE,
-)
 
-regular_regex = re.compile(
-    r"""(
-#\d\d\d\d OPPONENTS\s*
-DATE\|\|OPPONENT\|TIME\|\s*
-\|:---:\|:--:\|:--\|:---:\|
-)(.|\s)*?(
--{3,})""",
-    re.DOTALL | re.IGNORECASE,
-)
+@dataclass(frozen=True)
+class SidebarSection:
+    """Table in the old reddit sidebar, from its title line to the next `---` line"""
+
+    name: str
+    title: re.Pattern[str]
+    header: tuple[str, ...]
+
 
-standings_regex = re.compile(
-    r"""(
-#AFCN Standings\s*
-\|\|W-L\|Home\|Away\|Div\|Streak\|\s*
-\|:---:\|:--:\|:--:\|:--:\|:--:\|:--:\|
-)(.|\s)*?(
--{3,})""",
-    re.DOTALL | re.IGNORECASE,
+PRESEASON_SECTION: Final = SidebarSection(
+    "preseason",
+    re.compile(r"#PRESEASON OPPONENTS", re.IGNORECASE),
+    ("DATE|OPPONENT|TIME|", "|:---:|:--:|:---:|"),
 )
+REGULAR_SECTION: Final = SidebarSection(
+    "regular",
+    re.compile(r"#\d\d\d\d OPPONENTS", re.IGNORECASE),
+    ("DATE||OPPONENT|TIME|", "|:---:|:--:|:--|:---:|"),
+)
+STANDINGS_SECTION_NAME: Final = "standings"
+STANDINGS_HEADER: Final = ("||W-L|Home|Away|Div|Streak|", "|:---:|:--:|:--:|:--:|:--:|:--:|")
+
+
+def get_regular_widget(season: str) -> str:
+    return f"{season} Opponents"
+
+
+def get_standings_widget(division: str) -> str:
+    """
+    Name of the standings widget and sidebar section of a division.
+
+    example: get_standings_widget("AFC_NORTH") == "AFCN Standings"
+    """
+    return f"{get_division_short_name(division)} Standings"
+
+
+def get_standings_section(division: str) -> SidebarSection:
+    title = re.compile(re.escape(f"#{get_standings_widget(division)}"), re.IGNORECASE)
+    return SidebarSection(STANDINGS_SECTION_NAME, title, STANDINGS_HEADER)
+
+
+def get_sidebar_sections(division: str | None) -> tuple[SidebarSection, ...]:
+    if division is None:
+        return (PRESEASON_SECTION, REGULAR_SECTION)
+    return (PRESEASON_SECTION, REGULAR_SECTION, get_standings_section(division))
+
+
+# Sections every sidebar can have, the standings table depends on the division of the team
+SIDEBAR_SECTIONS: Final = get_sidebar_sections(None)
+
+
+def find_sections(desc: str, sections: tuple[SidebarSection, ...] = SIDEBAR_SECTIONS) -> dict[str, tuple[int, int]]:
+    """
+    Find the body of every section in a single pass over the lines of the sidebar.
+
+    Returns the (start, end) offsets of the first body of each section, the
+    title and table header before it and the `---` line after it are not
+    part of the body.
+    """
+    spans: dict[str, tuple[int, int]] = {}
+    section: SidebarSection | None = None
+    header_index = 0
+    body_start = -1
+    offset = 0
+    # End of the text of the previous line, before its line break
+    previous_end = 0
+    for line in desc.splitlines(keepends=True):
+        stripped = line.strip()
+        if body_start >= 0 and section:
+            if stripped.startswith("---"):
+                spans[section.name] = (body_start, max(previous_end, body_start))
+                section = None
+                body_start = -1
+        elif section and not stripped:
+            pass
+        elif section and stripped.lower() == section.header[header_index].lower():
+            header_index += 1
+            if header_index == len(section.header):
+                body_start = offset + len(line)
+        else:
+            section = None
+            for candidate in sections:
+                if candidate.name not in spans and candidate.title.fullmatch(stripped):
+                    section = candidate
+                    header_index = 0
+                    break
+        previous_end = offset + len(line.rstrip("\r\n"))
+        offset += len(line)
+    return spans
+
+
+def replace_sections(desc: str, bodies: dict[str, str], sections: tuple[SidebarSection, ...] = SIDEBAR_SECTIONS) -> str:
+    """Swap in the new body of every section found in the sidebar, rebuilding it once"""
+    spans = sorted((span, bodies[name]) for name, span in find_sections(desc, sections).items() if name in bodies)
+    pieces = []
+    position = 0
+    for (start, end), body in spans:
+        pieces.append(desc[position:start])
+        pieces.append(body)
+        if body and start == end and not desc.startswith(("\n", "\r"), end):
+            # The section was empty, so the `---` line follows the header and needs its own line again
+            pieces.append("\r\n" if desc.endswith("\r\n", 0, start) else "\n")
+        position = end
+    pieces.append(desc[position:])
+    return "".join(pieces)
 
 
 def get_game_outcome(game: Game) -> str:
@@ -127,38 +215,84 @@ async def update_sidebar_score(
     sr_name: str,
     games: list[Game],
     records: list[Record],
+    store: ContentHashStore = content_hashes,
 ) -> None:
     seasons = _get_seasons(games)
     standings = _get_records(records)
-
-    # Update old reddit
     sr_browns = await reddit.subreddit(sr_name)
-    settings = sr_browns.mod.settings()
 
-    desc = settings["description"]
-    new_desc = re.sub(standings_regex, r"\1" + standings + r"\3", desc, 1)
-    new_desc = re.sub(preseason_regex, r"\1" + seasons["preseason"] + r"\3", new_desc, 1)
-    new_desc = re.sub(regular_regex, r"\1" + seasons["regular"] + r"\3", new_desc, 1)
+    # The tables are named after the division of the team and the season, like "AFCN Standings" and "2021 Opponents"
+    division = records[0].division if records else None
+    sections = get_sidebar_sections(division)
+    bodies = {
+        STANDINGS_SECTION_NAME: standings,
+        PRESEASON_SECTION.name: seasons["preseason"],
+        REGULAR_SECTION.name: seasons["regular"],
+    }
+    widget_texts = {PRESEASON_WIDGET: season_table_header + seasons["preseason"]}
+    if games:
+        widget_texts[get_regular_widget(games[0].season)] = season_table_header + seasons["regular"]
+    if division is not None:
+        widget_texts[get_standings_widget(division)] = standings_table_header + standings
+    await asyncio.gather(
+        _update_old_sidebar(sr_browns, bodies, sections, store),
+        _update_new_sidebar(sr_browns, widget_texts, store),
+    )
+
+
+async def _update_old_sidebar(
+    sr: Subreddit,
+    bodies: dict[str, str],
+    sections: tuple[SidebarSection, ...],
+    store: ContentHashStore,
+) -> None:
+    key = f"{sr.display_name}/config/sidebar"
+    content = json.dumps([bodies, [section.title.pattern for section in sections]], sort_keys=True)
+    if store.is_current(key, content):
+        return
+
+    settings = await call_with_backoff(sr.mod.settings)
+    desc = str(settings["description"])
+    new_desc = replace_sections(desc, bodies, sections)
 
     if desc != new_desc:
         # Normal method of updating doesn't work, but this work around does
         # https://www.reddit.com/r/redditdev/comments/hztfgc/praw_subredditmoderationupdate_not_updating/
-        # sr_browns.mod.update(description=new_desc)
-        sr_browns.wiki["config/sidebar"].edit(new_desc)
-
-    # Update new reddit
-    widgets = sr_browns.widgets
-
-    preseason = season_table_header + seasons["preseason"]
-    regular = season_table_header + seasons["regular"]
-    standings = standings_table_header + standings
-    for widget in widgets.sidebar:
-        if widget.shortName == "Preseason Opponents":
-            if widget.text != preseason:
-                widget.mod.update(text=preseason)
-        elif widget.shortName == "2021 Opponents":
-            if widget.text != regular:
-                widget.mod.update(text=regular)
-        elif widget.shortName == "AFCN Standings":
-            if widget.text != standings:
-                widget.mod.update(text=standings)
+        # sr.mod.update(description=new_desc)
+        page = await sr.wiki.get_page("config/sidebar", fetch=False)
+        await call_with_backoff(lambda: page.edit(content=new_desc))
+    store.record(key, content)
+
+
+async def _update_new_sidebar(sr: Subreddit, widget_texts: dict[str, str], store: ContentHashStore) -> None:
+    """Fetch the sidebar widgets once and send only the changed ones, concurrently"""
+    stale = {
+        short_name: text
+        for short_name, text in widget_texts.items()
+        if not store.is_current(f"{sr.display_name}/widget/{short_name}", text)
+    }
+    if not stale:
+        return
+
+    updates: list[tuple[Widget, str]] = []
+    missing = dict(stale)
+    async for widget in sr.widgets.sidebar():
+        text = missing.pop(widget.shortName, None)
+        if text is None:
+            continue
+        elif widget.text == text:
+            store.record(f"{sr.display_name}/widget/{widget.shortName}", text)
+        else:
+            updates.append((widget, text))
+
+    # Widgets the subreddit doesn't have are recorded too, so they are only looked for again once the hash expires
+    for short_name, text in missing.items():
+        logger.info(f"r/{sr.display_name} has no {short_name} widget")
+        store.record(f"{sr.display_name}/widget/{short_name}", text)
+
+    await asyncio.gather(*(_update_widget(sr, widget, text, store) for widget, text in updates))
+
+
+async def _update_widget(sr: Subreddit, widget: Widget, text: str, store: ContentHashStore) -> None:
+    await call_with_backoff(lambda: widget.mod.update(text=text))
+    store.record(f"{sr.display_name}/widget/{widget.shortName}", text)
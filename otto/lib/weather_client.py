@@ -1,20 +1,24 @@
 from datetime import datetime
 
-from requests import get
-
 from otto.models.weather import Weather
 from otto.utils import convert_tzstring, get_now
+from otto.utils.http import get_session, run_sync
 
 
 class WeatherClient:
     def get_weather(self, lat: float, long: float, date: datetime = get_now()) -> Weather | None:
+        return run_sync(self.fetch_weather(lat, long, date))
+
+    async def fetch_weather(self, lat: float, long: float, date: datetime | None = None) -> Weather | None:
+        date = date or get_now()
+        session = get_session()
         url = f"https://api.weather.gov/points/{lat},{long}"
-        res = get(url)
+        async with session.get(url) as res:
+            links = await res.json(content_type=None)
 
-        links = res.json()
         if links and "properties" in links:
-            res = get(links["properties"].get("forecast"))
-            weather = res.json()
+            async with session.get(links["properties"].get("forecast")) as res:
+                weather = await res.json(content_type=None)
 
             periods = weather["properties"]["periods"]
             for period in periods:
@@ -22,5 +26,5 @@ class WeatherClient:
                 forecast_end = convert_tzstring(period["endTime"])
 
                 if forecast_start <= date and forecast_end >= date:
-                    return Weather(period)
+                    return Weather.from_nws_dict(period)
         return None
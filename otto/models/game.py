@@ -1,14 +1,23 @@
-from dataclasses import dataclass
+import bisect
+import operator
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
-from otto import TEAM_NAME
+from otto import KEEP_RAW_DATA, TEAM_NAME
 from otto.models.team import Team
 from otto.utils import convert_isostring, get_now
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Game:
+    """
+    One game as seen by one team.
+
+    The raw NFL payload is only kept in `data` when asked for, to debug a game.
+    """
+
     id: str
     game_detail_id: str | None
     game_time: datetime
@@ -23,9 +32,9 @@ class Game:
     venue_name: str
     venue_city: str
     venue_state: str
-    networks: list[str]
+    networks: tuple[str, ...]
 
-    data: dict[str, Any]
+    data: dict[str, Any] | None = field(default=None, compare=False, repr=False)
 
     @property
     def time_until_game(self) -> timedelta:
@@ -34,7 +43,8 @@ class Game:
         return datetime(1970, 1, 1) - get_now()
 
     @classmethod
-    def from_nfl_dict(cls, data: dict[str, Any]) -> "Game":
+    def from_nfl_dict(cls, data: dict[str, Any], team: str = TEAM_NAME, raw: bool = KEEP_RAW_DATA) -> "Game":
+        """Build the game as seen by `team`, which decides `at_home` and `opponent`"""
         assert data
 
         id = data["id"]
@@ -58,14 +68,14 @@ class Game:
 
         network_channels = data.get("networkChannels")
         assert isinstance(network_channels, dict)
-        networks = network_channels["data"]
+        networks = tuple(network_channels["data"])
 
         visitor_team = data["visitorTeam"]
         home_team = data["homeTeam"]
 
         at_home = False
         opponent = Team("", "")
-        if visitor_team and isinstance(visitor_team, dict) and visitor_team.get("abbr") != TEAM_NAME:
+        if visitor_team and isinstance(visitor_team, dict) and visitor_team.get("abbr") != team:
             at_home = True
             opponent = Team(visitor_team.get("abbr", ""), visitor_team.get("nickName", ""))
         elif home_team and isinstance(home_team, dict):
@@ -102,25 +112,39 @@ class Game:
             venue_city=venue_city,
             venue_state=venue_state,
             networks=networks,
-            data=data,
+            data=data if raw else None,
         )
 
 
-def get_next_game(games: list[Game], next_opp_delay: timedelta) -> Game | None:
-    next_game = None
-    games.sort(key=lambda game: game.time_until_game)
-    games_after_delay = [game for game in games if game.time_until_game and next_opp_delay < game.time_until_game]
-    if games_after_delay:
-        next_game = games_after_delay[0]
+class SeasonTimeline:
+    """
+    Games of a season sorted once by kickoff, for next and last game lookups by bisection.
+
+    The games passed in are copied, never reordered.
+    """
+
+    __slots__ = ("games", "_times")
+
+    def __init__(self, games: Iterable[Game]) -> None:
+        self.games = sorted(games, key=operator.attrgetter("game_time"))
+        self._times = [game.game_time for game in self.games]
+
+    def get_next_game(self, delay: timedelta = timedelta(), now: datetime | None = None) -> Game | None:
+        """First game kicking off more than `delay` from now"""
+        cutoff = (now or get_now()) + delay
+        index = bisect.bisect_right(self._times, cutoff)
+        return self.games[index] if index < len(self.games) else None
+
+    def get_last_game(self, delay: timedelta = timedelta(), now: datetime | None = None) -> Game | None:
+        """Last game that kicked off less than `delay` from now"""
+        cutoff = (now or get_now()) + delay
+        index = bisect.bisect_left(self._times, cutoff)
+        return self.games[index - 1] if index > 0 else None
 
-    return next_game
 
+def get_next_game(games: list[Game], next_opp_delay: timedelta, now: datetime | None = None) -> Game | None:
+    return SeasonTimeline(games).get_next_game(next_opp_delay, now)
 
-def get_last_game(games: list[Game], next_opp_delay: timedelta) -> Game | None:
-    next_game = None
-    games.sort(key=lambda game: game.time_until_game, reverse=True)
-    games_before_delay = [game for game in games if game.time_until_game and next_opp_delay > game.time_until_game]
-    if games_before_delay:
-        next_game = games_before_delay[0]
 
-    return next_game
+def get_last_game(games: list[Game], next_opp_delay: timedelta, now: datetime | None = None) -> Game | None:
+    return SeasonTimeline(games).get_last_game(next_opp_delay, now)
@@ -0,0 +1,133 @@
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any, Final
+
+from otto.models.record import Record
+from otto.models.team import get_abbr
+
+# Splits kept as int columns, named after the fields of the NFL team record
+INT_COLUMNS: Final = (
+    "overallWin",
+    "overallLoss",
+    "overallTie",
+    "overallPtsFor",
+    "overallPtsAgainst",
+    "homeWin",
+    "homeLoss",
+    "homeTie",
+    "roadWin",
+    "roadLoss",
+    "roadTie",
+    "divisionWin",
+    "divisionLoss",
+    "divisionTie",
+    "divisionRank",
+    "conferenceWin",
+    "conferenceLoss",
+    "conferenceTie",
+    "conferenceRank",
+)
+
+
+def _get_pct(win: int, loss: int, tie: int) -> float:
+    games = win + loss + tie
+    return (win + tie / 2) / games if games else 0.0
+
+
+class StandingsTable:
+    """
+    Standings of the whole league stored by column, one row per team.
+
+    Rows are grouped by division and conference when the table is built, and
+    win percentages and point differentials are computed once for every row,
+    so any division or conference view is a lookup and a sort of a few ints.
+
+    example: table.get_records(table.get_division("AFC_NORTH"))
+    """
+
+    def __init__(self, team_records: Sequence[dict[str, Any]]) -> None:
+        self.abbrs = [get_abbr(data["nickName"]) for data in team_records]
+        self.divisions = [data["division"] for data in team_records]
+        self.conferences = [data["conference"] for data in team_records]
+        self.streaks = [data["overallStreak"] for data in team_records]
+        self.columns = {column: array("i", (int(data[column] or 0) for data in team_records)) for column in INT_COLUMNS}
+
+        win, loss, tie = self.columns["overallWin"], self.columns["overallLoss"], self.columns["overallTie"]
+        self.win_pcts = array("d", map(_get_pct, win, loss, tie))
+        self.conference_pcts = array(
+            "d",
+            map(_get_pct, self.columns["conferenceWin"], self.columns["conferenceLoss"], self.columns["conferenceTie"]),
+        )
+        self.point_differentials = array(
+            "i", (a - b for a, b in zip(self.columns["overallPtsFor"], self.columns["overallPtsAgainst"]))
+        )
+
+        self.by_abbr = {abbr: row for row, abbr in enumerate(self.abbrs)}
+        self.by_division: dict[str, list[int]] = {}
+        self.by_conference: dict[str, list[int]] = {}
+        for row, (division, conference) in enumerate(zip(self.divisions, self.conferences)):
+            self.by_division.setdefault(division, []).append(row)
+            self.by_conference.setdefault(conference, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self.abbrs)
+
+    def get_division(self, division: str) -> list[int]:
+        """Rows of a division in the order of the official division rank"""
+        return sorted(self.by_division.get(division, []), key=self.columns["divisionRank"].__getitem__)
+
+    def get_conference(self, conference: str) -> list[int]:
+        """Rows of a conference in the order of the official conference rank"""
+        return sorted(self.by_conference.get(conference, []), key=self.columns["conferenceRank"].__getitem__)
+
+    def get_team_division(self, abbr: str) -> list[int]:
+        row = self.by_abbr.get(abbr)
+        return self.get_division(self.divisions[row]) if row is not None else []
+
+    def rank(self, rows: Iterable[int]) -> list[int]:
+        """
+        Order rows by win percentage, then conference win percentage, then point differential.
+
+        This is a local approximation of the NFL tiebreakers, which need head-to-head results.
+        """
+        return sorted(
+            rows,
+            key=lambda row: (-self.win_pcts[row], -self.conference_pcts[row], -self.point_differentials[row]),
+        )
+
+    def get_seeds(self, conference: str) -> list[int]:
+        """Rows of a conference in playoff seed order, division winners first"""
+        rows = self.by_conference.get(conference, [])
+        divisions = {self.divisions[row] for row in rows}
+        winners = {self.rank(self.by_division[division])[0] for division in divisions}
+        ranked = self.rank(rows)
+        return [row for row in ranked if row in winners] + [row for row in ranked if row not in winners]
+
+    def get_record(self, row: int) -> Record:
+        column = self.columns
+        return Record(
+            abbr=self.abbrs[row],
+            win=column["overallWin"][row],
+            loss=column["overallLoss"][row],
+            tie=column["overallTie"][row],
+            streak=self.streaks[row],
+            conference=self.conferences[row],
+            conference_rank=column["conferenceRank"][row],
+            conference_win=column["conferenceWin"][row],
+            conference_loss=column["conferenceLoss"][row],
+            conference_tie=column["conferenceTie"][row],
+            division=self.divisions[row],
+            division_rank=column["divisionRank"][row],
+            division_win=column["divisionWin"][row],
+            division_loss=column["divisionLoss"][row],
+            division_tie=column["divisionTie"][row],
+            home_win=column["homeWin"][row],
+            home_loss=column["homeLoss"][row],
+            home_tie=column["homeTie"][row],
+            road_win=column["roadWin"][row],
+            road_loss=column["roadLoss"][row],
+            road_tie=column["roadTie"][row],
+        )
+
+    def get_records(self, rows: Iterable[int]) -> list[Record]:
+        return [self.get_record(row) for row in rows]
@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 
 from otto import ASSETS_DIRECTORY
 
@@ -202,6 +203,16 @@ def get_name(id: str) -> str:
     return ABBR_TO_NAME[id]
 
 
+def get_division_short_name(division: str) -> str:
+    """
+    Short name of a division, as used in the sidebar of the subreddits.
+
+    example: get_division_short_name("AFC_NORTH") == "AFCN"
+    """
+    conference, _, direction = division.partition("_")
+    return conference + direction[:1]
+
+
 def get_small_icon_path(abbr: str) -> str:
     return os.path.normpath(ASSETS_DIRECTORY + f"/small-teams/{abbr}.png")
 
@@ -210,10 +221,7 @@ def get_small_bw_icon_path(abbr: str) -> str:
     return os.path.normpath(ASSETS_DIRECTORY + f"/small-bw-teams/{abbr}.png")
 
 
+@dataclass(frozen=True, slots=True)
 class Team:
     abbr: str
     name: str
-
-    def __init__(self, abbr: str, name: str) -> None:
-        self.abbr = abbr
-        self.name = name
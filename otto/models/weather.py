@@ -1,11 +1,18 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
 class Weather:
     forecast: str
     temperature: int
     wind_speed: str
     wind_direction: str
 
-    def __init__(self, data: dict[str, str]):
-        self.forecast = data["shortForecast"]
-        self.temperature = int(data["temperature"])
-        self.wind_direction = data["windDirection"]
-        self.wind_speed = data["windSpeed"]
+    @classmethod
+    def from_nws_dict(cls, data: dict[str, str]) -> "Weather":
+        return cls(
+            forecast=data["shortForecast"],
+            temperature=int(data["temperature"]),
+            wind_direction=data["windDirection"],
+            wind_speed=data["windSpeed"],
+        )
@@ -3,11 +3,16 @@ import datetime
 import logging
 from typing import Final
 
+from asyncpraw.models import Submission
 from asyncpraw.models.reddit.subreddit import Subreddit
 
 from otto import SUBREDDIT_NAME, get_reddit
 from otto.config import get_config
-from otto.lib.check_posts import check_post
+from otto.lib.browser import browser_service
+from otto.lib.check_posts import PostProgress, check_post
+from otto.lib.post_pipeline import PostPipeline
+from otto.lib.stream_checkpoint import StreamCheckpoint, stream_checkpoint
+from otto.lib.twitter_client import TWEET_PROFILE
 
 logger: Final = logging.getLogger(__name__)
 
@@ -16,15 +21,41 @@ def run() -> None:
     asyncio.run(stream_posts())
 
 
-async def stream_posts() -> None:
-    while True:
-        async with get_reddit() as reddit:
-            config = await get_config(reddit, SUBREDDIT_NAME)
-            logger.info(f"Streaming posts: {datetime.datetime.now()}")
-
-            sr: Subreddit = await reddit.subreddit(SUBREDDIT_NAME)
-            async for post in sr.stream.submissions(skip_existing=True):
-                await check_post(config, post)
+async def stream_posts(checkpoint: StreamCheckpoint = stream_checkpoint) -> None:
+    try:
+        await browser_service.warm(TWEET_PROFILE)
+        while True:
+            async with get_reddit() as reddit:
+                config = await get_config(reddit, SUBREDDIT_NAME)
+                sr: Subreddit = await reddit.subreddit(SUBREDDIT_NAME)
+
+                # Mod actions started on posts that are still being retried
+                progress: dict[str, PostProgress] = {}
+
+                # Only checked posts move the checkpoint, failed ones are retried by the pipeline until it gives up
+                async def check(post: Submission) -> None:
+                    await check_post(config, post, progress.setdefault(post.id, PostProgress()))
+                    finish(post)
+
+                def finish(post: Submission) -> None:
+                    progress.pop(post.id, None)
+                    checkpoint.finish(post)
+
+                async with PostPipeline(check, on_give_up=finish) as pipeline:
+                    backfill = await checkpoint.get_backfill(sr)
+                    logger.info(f"Backfilling {len(backfill)} posts since {checkpoint.id}: {datetime.datetime.now()}")
+                    for post in backfill:
+                        checkpoint.start(post)
+                        await pipeline.put(post)
+
+                    # Without a checkpoint there is nothing to resume from, so posts from before the start are skipped
+                    logger.info(f"Streaming posts: {datetime.datetime.now()}")
+                    async for post in sr.stream.submissions(skip_existing=checkpoint.id is None):
+                        if checkpoint.should_check(post):
+                            checkpoint.start(post)
+                            await pipeline.put(post)
+    finally:
+        await browser_service.close()
 
 
 if __name__ == "__main__":
@@ -1,19 +1,49 @@
 import asyncio
+import functools
 import os
 import tempfile
 import urllib.parse
 import urllib.request
-from collections.abc import Callable, Coroutine
-from datetime import datetime
+from collections.abc import Callable, Coroutine, Mapping
+from datetime import UTC, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Final, TypeVar
+from zoneinfo import ZoneInfo
 
-import pytz
 import requests
 
-TIMEZONE = pytz.timezone("America/New_York")
+from otto.utils.timer import Timer
+
+T = TypeVar("T")
+
+TIMEZONE: Final = ZoneInfo("America/New_York")
+# Parsed timestamps are memoized, the same kickoff and forecast times come back on every poll
+TIMESTAMP_CACHE_SIZE: Final = 4096
+HTTP_MONTHS: Final = {
+    month: number
+    for number, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1
+    )
+}
+
+
+def to_local(d: datetime) -> datetime:
+    """
+    Convert an aware datetime to New York time, with a fixed utc offset like pytz used to give.
+
+    Times converted this way subtract and compare in absolute time, even across daylight saving changes.
+    """
+    local = d.astimezone(TIMEZONE)
+    return local.replace(tzinfo=_get_fixed_zone(local.utcoffset(), local.tzname()))
+
+
+@functools.cache
+def _get_fixed_zone(offset: timedelta | None, name: str | None) -> timezone:
+    return timezone(offset or timedelta(), name) if name else timezone(offset or timedelta())
 
 
 def get_now() -> datetime:
-    return datetime.now(tz=TIMEZONE)
+    return to_local(datetime.now(tz=UTC))
 
 
 def get_time(d: datetime) -> str:
@@ -39,22 +69,30 @@ def get_date(d: datetime) -> str:
 #     return date_str
 
 
+@functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
 def convert_isostring(dt: str) -> datetime:
-    d = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S.%f%z")
-    d = d.astimezone(TIMEZONE)
-    return d
+    """dt example: "2019-08-08T16:30:00.000-07:00" """
+    return to_local(datetime.fromisoformat(dt))
 
 
+@functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
 def convert_tzstring(dt: str) -> datetime:
-    d = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S%z")
-    d = d.astimezone(TIMEZONE)
-    return d
+    """dt example: "2021-09-12T13:00:00-04:00" """
+    return to_local(datetime.fromisoformat(dt))
 
 
+@functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
 def convert_httpstring(dt: str) -> datetime:
-    d = datetime.strptime(dt, "%a, %d %b %Y %H:%M:%S %Z")
-    d = d.astimezone(TIMEZONE)
-    return d
+    """dt example: "Wed, 21 Oct 2015 07:28:00 GMT" """
+    try:
+        _, day, month, year, time, zone = dt.split()
+        hour, minute, second = time.split(":")
+        if zone != "GMT":
+            raise ValueError(zone)
+        d = datetime(int(year), HTTP_MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=UTC)
+    except (KeyError, ValueError):
+        d = parsedate_to_datetime(dt)
+    return to_local(d)
 
 
 def download_image(image_url: str) -> str:
@@ -86,3 +124,28 @@ async def repeat(interval: float, func: Callable[[], Coroutine[None, None, None]
             func(),
             asyncio.sleep(interval),
         )
+
+
+async def timed_gather(
+    fetches: Mapping[str, Coroutine[Any, Any, T]],
+    limit: int,
+) -> tuple[dict[str, T], dict[str, float]]:
+    """Run all fetches concurrently, at most *limit* at a time.
+
+    Returns the results and the elapsed seconds of every fetch, both keyed by
+    the fetch name. Time spent waiting for a free slot is not counted.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    timings: dict[str, float] = {}
+
+    async def _run(name: str, coro: Coroutine[Any, Any, T]) -> T:
+        timer = Timer()
+        async with semaphore:
+            try:
+                with timer:
+                    return await coro
+            finally:
+                timings[name] = timer.elapsed
+
+    results = await asyncio.gather(*(_run(name, coro) for name, coro in fetches.items()))
+    return dict(zip(fetches, results)), timings
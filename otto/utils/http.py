@@ -0,0 +1,62 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, Final, TypeVar
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+HTTP_TIMEOUT: Final = ClientTimeout(total=30, connect=10)
+HTTP_LIMIT: Final = 64
+HTTP_LIMIT_PER_HOST: Final = 8
+HTTP_KEEPALIVE_TIMEOUT: Final = 60.0
+HTTP_DNS_CACHE_TTL: Final = 300
+
+T = TypeVar("T")
+
+_session: ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_session() -> ClientSession:
+    """Return the shared, pooled HTTP session for the running event loop.
+
+    The session is created lazily and reused by every caller, so connections
+    are kept alive between requests instead of paying for a new TCP/TLS
+    handshake on every fetch.
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = TCPConnector(
+            limit=HTTP_LIMIT,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        )
+        _session = ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro on a fresh event loop and close the shared session afterwards.
+
+    Only meant for scripts, never call this from inside a running event loop.
+    """
+
+    async def _run() -> T:
+        try:
+            return await coro
+        finally:
+            await close_session()
+
+    return asyncio.run(_run())
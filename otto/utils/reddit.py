@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Final, TypeVar
+
+from asyncpraw.exceptions import RedditAPIException
+from asyncprawcore.exceptions import ServerError, TooManyRequests
+
+logger: Final = logging.getLogger(__name__)
+
+REDDIT_ATTEMPTS: Final = 4
+REDDIT_BACKOFF: Final = 2.0
+REDDIT_MAX_DELAY: Final = 60.0
+
+T = TypeVar("T")
+
+
+def get_retry_delay(err: BaseException, attempt: int) -> float | None:
+    """
+    Seconds to wait before retrying a reddit call that failed with `err`, None when it shouldn't be retried.
+
+    Reddit's retry-after header is honored when present, otherwise the delay backs off exponentially.
+    """
+    backoff = min(REDDIT_BACKOFF * 2.0**attempt, REDDIT_MAX_DELAY)
+    if isinstance(err, TooManyRequests):
+        try:
+            return min(float(err.retry_after), REDDIT_MAX_DELAY) if err.retry_after else backoff
+        except ValueError:
+            return backoff
+    elif isinstance(err, ServerError):
+        return backoff
+    elif isinstance(err, RedditAPIException) and any(item.error_type == "RATELIMIT" for item in err.items):
+        return backoff
+    return None
+
+
+async def call_with_backoff(call: Callable[[], Awaitable[T]], attempts: int = REDDIT_ATTEMPTS) -> T:
+    """
+    Await a reddit call, retrying it when reddit rate limits it or has a hiccup.
+
+    example: await call_with_backoff(lambda: widget.mod.update(text=text))
+    """
+    for attempt in range(attempts - 1):
+        try:
+            return await call()
+        except Exception as e:
+            delay = get_retry_delay(e, attempt)
+            if delay is None:
+                raise
+            logger.warning(f"Reddit call failed ({e}), retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+    return await call()
@@ -10,22 +10,22 @@ class Timer:
     _start: float
     _end: float
     _elapsed: float
-    __slots__: tuple[str, ...] = tuple()
+    __slots__: tuple[str, ...] = ("_start", "_end", "_elapsed")
 
     @property
     def elapsed(self) -> float:
         return self._elapsed
 
     def __enter__(self) -> Timer:
-        self._start
+        self.start()
         return self
 
     def __exit__(self, *_: Any) -> None:
         self.stop()
 
     def start(self) -> None:
-        self._start = time.time()
+        self._start = time.perf_counter()
 
     def stop(self) -> None:
-        self._end = time.time()
+        self._end = time.perf_counter()
         self._elapsed = self._end - self._start
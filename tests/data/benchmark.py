@@ -0,0 +1,137 @@
+import gc
+import glob
+import json
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+DATA_DIRECTORY = os.path.dirname(__file__)
+SEASONS = 50
+ROUNDS = 20
+HALF_YEAR = timedelta(days=182)
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(DATA_DIRECTORY, f"{name}.json")) as f:
+        return f.read()
+
+
+def measure(build: Callable[[], Any]) -> tuple[int, Any]:
+    """Bytes still allocated by `build` once it returns, along with what it built"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def benchmark_models() -> None:
+    """
+    Memory of the models, and of the league snapshot built from them, against keeping the raw payloads.
+
+    The NFL response cache still holds the last payload of each query, so
+    this is the saving on everything built from the payloads, not on the process.
+    """
+    from otto.lib.league import League
+    from otto.models.game import Game
+    from otto.models.standings import StandingsTable
+
+    scores = read_fixture("get_scores")
+    standings = read_fixture("get_standings")
+
+    def build(raw: bool) -> Callable[[], Any]:
+        def _build() -> Any:
+            # Every season is parsed from its own payload, like every poll of the API
+            seasons = []
+            for _ in range(SEASONS):
+                games = [Game.from_nfl_dict(data, raw=raw) for data in json.loads(scores)["data"]]
+                edges = json.loads(standings)["data"]["viewer"]["standings"]["edges"]
+                table = StandingsTable(edges[0]["node"]["teamRecords"])
+                records = table.get_records(range(len(table)))
+                seasons.append((games, records))
+            return seasons
+
+        return _build
+
+    compact, seasons = measure(build(raw=False))
+    raw, _ = measure(build(raw=True))
+    games, records = seasons[0]
+
+    print(f"{SEASONS} seasons of {len(games)} games and {len(records)} standings records")
+    print(f"compact models: {compact / 1024:.0f} KiB")
+    print(f"raw models:     {raw / 1024:.0f} KiB")
+    print(f"saved:          {(raw - compact) / 1024:.0f} KiB ({1 - compact / raw:.0%})")
+
+    def build_league() -> Any:
+        league = League()
+        league.update_schedule(json.loads(scores)["data"])
+        return league
+
+    league_size, _ = measure(build_league)
+    payload_size, _ = measure(lambda: json.loads(scores)["data"])
+    print(f"league snapshot: {league_size / 1024:.0f} KiB, without the {payload_size / 1024:.0f} KiB payload")
+    print(f"Game instance:   {sys.getsizeof(games[0])} bytes, has __dict__: {hasattr(games[0], '__dict__')}")
+    print(f"Record instance: {sys.getsizeof(records[0])} bytes, has __dict__: {hasattr(records[0], '__dict__')}")
+
+
+def benchmark_timestamps() -> None:
+    """Compare the timestamp parsers against the strptime and pytz versions they replaced"""
+    import pytz
+
+    from otto import utils
+
+    timezone = pytz.timezone("America/New_York")
+
+    def convert_isostring(dt: str) -> datetime:
+        return datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S.%f%z").astimezone(timezone)
+
+    def convert_tzstring(dt: str) -> datetime:
+        return datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S%z").astimezone(timezone)
+
+    # The old version read GMT as the local time of the machine, which is GMT where otto runs
+    def convert_httpstring(dt: str) -> datetime:
+        return datetime.strptime(dt, "%a, %d %b %Y %H:%M:%S %Z").replace(tzinfo=pytz.utc).astimezone(timezone)
+
+    isostrings: list[str] = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIRECTORY, "*.json"))):
+        with open(path) as f:
+            isostrings.extend(re.findall(r'"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+(?:Z|[+-]\d\d:\d\d))"', f.read()))
+    # Forecasts and http headers aren't in the fixtures, so they are made from the same instants
+    instants = [convert_isostring(dt) for dt in isostrings]
+    tzstrings = [d.isoformat() for d in instants]
+    httpstrings = [d.astimezone(pytz.utc).strftime("%a, %d %b %Y %H:%M:%S GMT") for d in instants]
+
+    cases = [
+        ("convert_isostring", isostrings, convert_isostring, utils.convert_isostring),
+        ("convert_tzstring", tzstrings, convert_tzstring, utils.convert_tzstring),
+        ("convert_httpstring", httpstrings, convert_httpstring, utils.convert_httpstring),
+    ]
+    print(f"{len(isostrings)} timestamps from the fixtures, parsed {ROUNDS} times")
+    for name, strings, old, new in cases:
+        for dt in strings:
+            expected, actual = old(dt), new(dt)
+            assert (expected, expected.isoformat(), expected.tzname()) == (actual, actual.isoformat(), actual.tzname())
+            # pytz gave fixed utc offsets, so date arithmetic has to keep the offset too
+            assert (expected + HALF_YEAR).isoformat() == (actual + HALF_YEAR).isoformat()
+
+        new.cache_clear()  # type: ignore
+        old_seconds = timeit.timeit(lambda: [old(dt) for dt in strings], number=ROUNDS)
+        cold_seconds = timeit.timeit(lambda: [new(dt) for dt in strings] and new.cache_clear(), number=ROUNDS)  # type: ignore
+        warm_seconds = timeit.timeit(lambda: [new(dt) for dt in strings], number=ROUNDS)
+        print(
+            f"{name}: strptime+pytz {old_seconds * 1000:.1f}ms, "
+            f"uncached {cold_seconds * 1000:.1f}ms ({old_seconds / cold_seconds:.1f}x), "
+            f"memoized {warm_seconds * 1000:.1f}ms ({old_seconds / warm_seconds:.1f}x), identical output"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_models()
+    benchmark_timestamps()
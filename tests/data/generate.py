@@ -14,18 +14,18 @@ def generate() -> None:
     from otto.lib.nfl_client import NFLClient
 
     nflclient = NFLClient()
-    _original_api_data = nflclient._get_api_data
+    _original_api_data = nflclient._fetch_api_data
 
-    def data_logger(url: str) -> Any:
+    async def data_logger(url: str) -> Any:
         curframe = inspect.currentframe()
         calframe = inspect.getouterframes(curframe, 2)
-        caller = calframe[1][3]
-        data = _original_api_data(url)
+        caller = calframe[1][3].replace("fetch_", "get_", 1)
+        data = await _original_api_data(url)
 
         record_data(caller, data)
         return data
 
-    nflclient._get_api_data = data_logger  # type: ignore
+    nflclient._fetch_api_data = data_logger  # type: ignore
 
     # NFL Client calls to get data
     nflclient.get_scores()
@@ -0,0 +1,35 @@
+import json
+import urllib.parse
+
+import pytest
+
+from otto.lib.nfl_queries import SCORES_QUERY, STAT_LEADERS_QUERY, Fragment, encode_value
+
+
+@pytest.mark.parametrize("value", ["CLE&fs={x}", "a+b", "a=b?c#d", "a/b;c", 'say "hi"'])
+def test_encode_value_escapes_reserved_chars(value: str) -> None:
+    encoded = encode_value(value)
+
+    assert not set(encoded) & set('&=+?#/;" {}')
+    assert json.loads(urllib.parse.unquote(encoded)) == value
+
+
+def test_encode_value_list() -> None:
+    assert urllib.parse.unquote(encode_value(["CLE", "A&B"])) == '["CLE", "A&B"]'
+    assert "&" not in encode_value(["CLE", "A&B"])
+
+
+def test_bind_keeps_value_in_its_parameter() -> None:
+    query = SCORES_QUERY.bind(team="CLE&fs={x}")
+
+    params = urllib.parse.parse_qs(urllib.parse.urlsplit(query).query)
+    assert set(params) == {"s", "fs"}
+    assert '"CLE&fs={x}"' in params["s"][0]
+
+
+def test_bind_fragment_is_not_escaped() -> None:
+    query = STAT_LEADERS_QUERY.bind(
+        season=2021, season_type="REG", teams=["CLE"], take=10, skip=0, projection=Fragment("passing{yards}")
+    )
+
+    assert "passing{yards}".replace("{", "%7B").replace("}", "%7D") in query
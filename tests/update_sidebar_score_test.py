@@ -0,0 +1,158 @@
+import re
+
+import pytest
+
+from otto.lib.update_sidebar_score import find_sections, get_sidebar_sections, replace_sections
+
+# The regexes find_sections replaced, to check that both edit a sidebar the same way
+preseason_regex = re.compile(
+    r"""(
+#PRESEASON OPPONENTS\s*
+DATE\|OPPONENT\|TIME\|\s*
+\|:---:\|:--:\|:---:\|
+)(.|\s)*?(
+-{3,})""",
+    re.DOTALL | re.IGNORECASE,
+)
+regular_regex = re.compile(
+    r"""(
+#\d\d\d\d OPPONENTS\s*
+DATE\|\|OPPONENT\|TIME\|\s*
+\|:---:\|:--:\|:--\|:---:\|
+)(.|\s)*?(
+-{3,})""",
+    re.DOTALL | re.IGNORECASE,
+)
+standings_regex = re.compile(
+    r"""(
+#AFCN Standings\s*
+\|\|W-L\|Home\|Away\|Div\|Streak\|\s*
+\|:---:\|:--:\|:--:\|:--:\|:--:\|:--:\|
+)(.|\s)*?(
+-{3,})""",
+    re.DOTALL | re.IGNORECASE,
+)
+
+SECTIONS = get_sidebar_sections("AFC_NORTH")
+
+SIDEBAR = """Welcome to r/Browns
+
+----
+
+#AFCN Standings
+
+||W-L|Home|Away|Div|Streak|
+|:---:|:--:|:--:|:--:|:--:|:--:|
+|[](/r/bengals)(CIN)|10-7|5-4|5-3|4-2|L1|
+|[](/r/steelers)(PIT)|9-7-1|6-2|3-5-1|4-2|W2|
+----
+
+#PRESEASON OPPONENTS
+
+DATE|OPPONENT|TIME|
+|:---:|:--:|:---:|
+|8/14|vs|[](/r/jaguars) JAX|W 23-13|
+----
+
+#2021 OPPONENTS
+
+DATE||OPPONENT|TIME|
+|:---:|:--:|:--|:---:|
+|9/12|@ |**[Chiefs](/r/kansascitychiefs)**|L 29-33|
+|BYE|||
+|1/9|vs|**[Bengals](/r/bengals)**|W 21-16|
+-----
+
+[Rules](/r/browns/about/rules)
+"""
+
+BODIES = {
+    "standings": "|[](/r/browns)(CLE)|8-9|4-4|4-5|3-3|L2|",
+    "preseason": "|8/22|@ |[](/r/giants) NYG|W 17-13|",
+    "regular": "|9/19|vs|**[Texans](/r/texans)**|W 31-21|\n|9/26|vs|**[Bears](/r/chicagobears)**|W 26-6|",
+}
+
+
+def replace_with_regexes(desc: str, bodies: dict[str, str]) -> str:
+    desc = re.sub(standings_regex, r"\1" + bodies["standings"] + r"\3", desc, 1)
+    desc = re.sub(preseason_regex, r"\1" + bodies["preseason"] + r"\3", desc, 1)
+    return re.sub(regular_regex, r"\1" + bodies["regular"] + r"\3", desc, 1)
+
+
+def find_bodies(desc: str) -> dict[str, str]:
+    return {name: desc[start:end] for name, (start, end) in find_sections(desc, SECTIONS).items()}
+
+
+def test_find_sections() -> None:
+    spans = find_sections(SIDEBAR, SECTIONS)
+
+    assert SIDEBAR[slice(*spans["standings"])] == (
+        "|[](/r/bengals)(CIN)|10-7|5-4|5-3|4-2|L1|\n|[](/r/steelers)(PIT)|9-7-1|6-2|3-5-1|4-2|W2|"
+    )
+    assert SIDEBAR[slice(*spans["preseason"])] == "|8/14|vs|[](/r/jaguars) JAX|W 23-13|"
+    assert SIDEBAR[slice(*spans["regular"])].endswith("|1/9|vs|**[Bengals](/r/bengals)**|W 21-16|")
+
+
+def test_find_sections_missing() -> None:
+    assert find_sections("#AFCN Standings\n\nno table here\n----\n", SECTIONS) == {}
+
+
+@pytest.mark.parametrize(
+    "bodies",
+    [
+        BODIES,
+        {name: "" for name in BODIES},
+        {name: body + "\n" + body for name, body in BODIES.items()},
+    ],
+)
+def test_replace_sections_matches_regexes(bodies: dict[str, str]) -> None:
+    assert replace_sections(SIDEBAR, bodies, SECTIONS) == replace_with_regexes(SIDEBAR, bodies)
+
+
+def test_replace_sections_only_given_bodies() -> None:
+    new_desc = replace_sections(SIDEBAR, {"preseason": BODIES["preseason"]}, SECTIONS)
+
+    assert new_desc == replace_with_regexes(SIDEBAR, {**find_bodies(SIDEBAR), "preseason": BODIES["preseason"]})
+
+
+def test_replace_sections_empty_body() -> None:
+    desc = "#PRESEASON OPPONENTS\n\nDATE|OPPONENT|TIME|\n|:---:|:--:|:---:|\n---\n\nafter\n"
+
+    new_desc = replace_sections(desc, {"preseason": BODIES["preseason"]}, SECTIONS)
+
+    assert new_desc == (
+        "#PRESEASON OPPONENTS\n\nDATE|OPPONENT|TIME|\n|:---:|:--:|:---:|\n" + BODIES["preseason"] + "\n---\n\nafter\n"
+    )
+    assert replace_sections(new_desc, {"preseason": BODIES["preseason"]}, SECTIONS) == new_desc
+
+
+def test_replace_sections_crlf() -> None:
+    desc = SIDEBAR.replace("\n", "\r\n")
+
+    new_desc = replace_sections(desc, BODIES, SECTIONS)
+
+    assert new_desc == replace_with_regexes(SIDEBAR, BODIES).replace("\n", "\r\n").replace(
+        BODIES["regular"].replace("\n", "\r\n"), BODIES["regular"]
+    )
+    assert replace_sections(new_desc, BODIES, SECTIONS) == new_desc
+
+
+def test_replace_sections_crlf_empty_body() -> None:
+    desc = "#PRESEASON OPPONENTS\r\nDATE|OPPONENT|TIME|\r\n|:---:|:--:|:---:|\r\n---\r\n"
+
+    new_desc = replace_sections(desc, {"preseason": BODIES["preseason"]}, SECTIONS)
+
+    assert (
+        new_desc
+        == "#PRESEASON OPPONENTS\r\nDATE|OPPONENT|TIME|\r\n|:---:|:--:|:---:|\r\n" + BODIES["preseason"] + "\r\n---\r\n"
+    )
+
+
+def test_find_sections_of_division() -> None:
+    desc = SIDEBAR.replace("#AFCN Standings", "#NFCE Standings")
+
+    assert "standings" not in find_sections(desc, SECTIONS)
+    assert (
+        find_sections(desc, get_sidebar_sections("NFC_EAST"))["standings"]
+        == find_sections(SIDEBAR, SECTIONS)["standings"]
+    )